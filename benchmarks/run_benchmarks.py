@@ -0,0 +1,332 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import laspy
+import numpy as np
+from shapely.geometry import box
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import synthetic_data
+from heat_priority.AOI_identify import identify_top_AOIs, sliding_window_aggregate
+from heat_priority.Align_ras import align_rasters
+from heat_priority.Validation import process_buildings
+from heat_priority.footprint_store import FootprintStore
+from heat_priority.land_use import remap, from_v2, to_solweig
+from heat_priority.write_to_raster import densify_points, grid_max_height
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+'''
+Benchmarks for the hot paths of the pipeline on seeded synthetic data.
+
+Each benchmark is timed over a few repeats at every size of its scaling series. The peak
+Python-traced memory (NumPy allocations included) of one extra run is recorded, as well as the
+peak resident set size of a run in a fresh process, which also covers GDAL's allocations. A
+benchmark that fails is recorded with its error and the others still run. Results are written to
+JSON after every benchmark, so two commits can be compared:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+'''
+
+# Scaling series per benchmark: raster side length in pixels, or number of LiDAR points
+SIZES = {
+    'sliding_window_aggregate': [64, 128, 256],
+    'identify_top_AOIs': [64, 128, 256],
+    'align_rasters': [256, 512, 1024],
+    'align_rasters_reproject': [256, 512, 1024],
+    'process_buildings': [64, 128, 256],
+    'remap': [256, 512, 1024],
+    'lidar_gridding': [5000, 20000, 50000],
+    'footprint_queries': [1000, 10000, 50000],
+}
+
+
+def raster_bounds(meta):
+    transform = meta['transform']
+    xmin, ymax = transform * (0, 0)
+    xmax, ymin = transform * (meta['width'], meta['height'])
+    return xmin, ymin, xmax, ymax
+
+
+def bench_sliding_window_aggregate(size, workdir, seed):
+    heat_score = synthetic_data.random_surface(size, seed) * 3
+    return lambda: sliding_window_aggregate(heat_score, 10)
+
+
+def bench_identify_top_AOIs(size, workdir, seed):
+    lst = synthetic_data.random_surface(size, seed, low=290.0, high=320.0)
+    ndvi = synthetic_data.random_surface(size, seed + 1, low=-0.2, high=0.9)
+    height = synthetic_data.random_surface(size, seed + 2, low=0.0, high=30.0)
+    meta = synthetic_data.synthetic_meta(size)
+    # 100 m AOIs on the 10 m grid, i.e. a 10 pixel window
+
+    def run():
+        # identify_top_AOIs prints the AOIs, which would bury the summary and time console I/O
+        with contextlib.redirect_stdout(io.StringIO()):
+            return identify_top_AOIs(lst, ndvi, height, meta, top_n=3, target_km=0.1)
+
+    return run
+
+
+def bench_align_rasters(size, workdir, seed):
+    paths = synthetic_data.write_heat_rasters(os.path.join(workdir, 'align'), size, seed)
+    return lambda: align_rasters(*paths, target_crs='EPSG:28992')
+
+
+def bench_align_rasters_reproject(size, workdir, seed):
+    paths = synthetic_data.write_heat_rasters(os.path.join(workdir, 'align_reproject'), size, seed,
+                                              crs=('EPSG:4326', 'EPSG:3857', 'EPSG:28992'))
+    return lambda: align_rasters(*paths, target_crs='EPSG:28992')
+
+
+def bench_process_buildings(size, workdir, seed):
+    folder = os.path.join(workdir, 'buildings')
+    os.makedirs(folder, exist_ok=True)
+    height = synthetic_data.random_surface(size, seed, nan_fraction=0.0, low=0.0, high=60.0)
+    raster_path = synthetic_data.write_raster(os.path.join(folder, f'dsm_{size}.tif'), height)
+    meta = synthetic_data.synthetic_meta(size)
+    bounds = raster_bounds(meta)
+    # Roughly one building per 20 x 20 pixels
+    vector_path = synthetic_data.write_buildings(os.path.join(folder, f'buildings_{size}.gpkg'), bounds,
+                                                 max(size * size // 400, 1), seed)
+    return lambda: process_buildings(raster_path, vector_path, box(*bounds))
+
+
+def bench_remap(size, workdir, seed):
+    land_use = synthetic_data.random_land_use(size, seed)
+    return lambda: remap(land_use, from_v2, to_solweig)
+
+
+def bench_footprint_queries(size, workdir, seed):
+    # One read of `size` buildings, then 100 AOI queries in a single batch
+    bounds = (120000.0, 480000.0, 130000.0, 490000.0)
+    vector_path = synthetic_data.write_buildings(os.path.join(workdir, f'footprints_{size}.gpkg'), bounds, size, seed)
+    rng = np.random.default_rng(seed)
+    corners = rng.uniform((bounds[0], bounds[1]), (bounds[2] - 2000, bounds[3] - 2000), (100, 2))
+    aois = [box(x, y, x + 2000, y + 2000) for x, y in corners]
+    return lambda: FootprintStore.from_file(vector_path).query_many(aois)
+
+
+def bench_lidar_gridding(size, workdir, seed):
+    bounds = (181437.0, 318805.0, 181937.0, 319305.0)
+    las_path = synthetic_data.write_las(os.path.join(workdir, f'points_{size}.las'), bounds, size, seed)
+
+    def run():
+        las = laspy.read(las_path)
+        vegetation = las.points[np.isin(las.classification, [3, 4, 5])]
+        densified_points = densify_points(vegetation.x, vegetation.y, vegetation.z)
+        return grid_max_height(densified_points, *bounds, cell_size=1)
+
+    return run
+
+
+BENCHMARKS = {
+    'sliding_window_aggregate': bench_sliding_window_aggregate,
+    'identify_top_AOIs': bench_identify_top_AOIs,
+    'align_rasters': bench_align_rasters,
+    'align_rasters_reproject': bench_align_rasters_reproject,
+    'process_buildings': bench_process_buildings,
+    'remap': bench_remap,
+    'lidar_gridding': bench_lidar_gridding,
+    'footprint_queries': bench_footprint_queries,
+}
+
+
+def measure(func, repeats):
+    """
+    Times a benchmark callable and records its peak traced memory.
+
+    Args:
+    - func: Zero-argument callable to benchmark.
+    - repeats: Number of timed runs.
+
+    Returns:
+    - Dict with the timings in seconds and the peak memory in MB.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate run, since tracemalloc slows down the timed ones
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'max_s': max(times),
+        'peak_mb': peak / 2 ** 20,
+    }
+
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+RSS_UNIT = 1 if sys.platform == 'darwin' else 2 ** 10
+
+
+def _proc_status(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 2 ** 10
+    except OSError:
+        return None
+
+
+def _reset_peak_rss():
+    # Resets VmHWM to the current RSS (Linux 4.0+)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _run_for_rss(name, size, workdir, seed):
+    func = BENCHMARKS[name](size, workdir, seed)
+    # On Linux a child inherits ru_maxrss from its parent, so VmHWM is used where available
+    if _reset_peak_rss():
+        before = _proc_status('VmRSS')
+    else:
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+    func()
+    after = _proc_status('VmHWM') or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+    return before, after
+
+
+def measure_rss(name, size, workdir, seed):
+    """
+    Runs a benchmark once in a fresh process and records its peak resident set size.
+
+    Unlike tracemalloc this includes memory allocated outside Python, e.g. by GDAL.
+
+    Returns:
+    - Dict with the peak RSS of the process during the run and its growth over the RSS after the
+      setup, in MB.
+    """
+    if resource is None:
+        return {}
+    folder = os.path.join(workdir, 'rss')
+    os.makedirs(folder, exist_ok=True)
+    # A spawned process does not share this one's memory or imports
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        before, after = executor.submit(_run_for_rss, name, size, folder, seed).result()
+    return {
+        'peak_rss_mb': after / 2 ** 20,
+        'run_rss_mb': (after - before) / 2 ** 20,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report, output):
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def run_benchmarks(names, repeats=3, seed=0, quick=False, output=None):
+    """
+    Runs the benchmarks and writes the report to output after each result, if given.
+
+    A benchmark that raises is recorded with an 'error' entry instead of its stats.
+    """
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'seed': seed,
+        'repeats': repeats,
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            sizes = SIZES[name][:1] if quick else SIZES[name]
+            for size in sizes:
+                try:
+                    func = BENCHMARKS[name](size, workdir, seed)
+                    stats = measure(func, repeats)
+                    stats.update(measure_rss(name, size, workdir, seed))
+                except Exception as error:
+                    print(f"{name:<26} size={size:<7} failed: {error!r}")
+                    report['results'].append({'name': name, 'size': size, 'error': repr(error)})
+                else:
+                    print(f"{name:<26} size={size:<7} median={stats['median_s']:.4f}s peak={stats['peak_mb']:.1f}MB"
+                          f" rss={stats.get('peak_rss_mb', float('nan')):.1f}MB")
+                    report['results'].append({'name': name, 'size': size, **stats})
+                if output is not None:
+                    write_report(report, output)
+    return report
+
+
+def compare(report, baseline):
+    """
+    Prints the median time and peak memory ratios of a report against a baseline report.
+
+    Benchmarks that failed in either report are skipped.
+    """
+    def ratio(new, old, key):
+        return new[key] / old[key] if old.get(key) and key in new else float('nan')
+
+    previous = {(r['name'], r['size']): r for r in baseline['results'] if 'error' not in r}
+    print(f"\nCompared with {baseline.get('commit')}:")
+    for result in report['results']:
+        old = previous.get((result['name'], result['size']))
+        if old is None or 'error' in result:
+            continue
+        print(f"{result['name']:<26} size={result['size']:<7} time x{ratio(result, old, 'median_s'):.2f}"
+              f" memory x{ratio(result, old, 'peak_mb'):.2f} rss x{ratio(result, old, 'peak_rss_mb'):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline hot paths on synthetic data.')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Benchmarks to run (default: all).')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per size.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data.')
+    parser.add_argument('--quick', action='store_true', help='Only run the smallest size of each benchmark.')
+    parser.add_argument('--output', default='benchmark_results.json', help='Path of the JSON report.')
+    parser.add_argument('--compare', help='JSON report of an earlier run to compare against.')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.only, args.repeats, args.seed, args.quick, output=args.output)
+    write_report(report, args.output)
+    print(f'Results saved to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
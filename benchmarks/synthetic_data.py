@@ -0,0 +1,195 @@
+import os
+
+import laspy
+import numpy as np
+import xarray as xr
+import geopandas as gpd
+import rasterio
+from rasterio.transform import from_origin
+from shapely.geometry import box
+
+'''
+Seeded synthetic data generators for the benchmarks. Every generator takes a seed so that
+runs on different commits time the exact same inputs.
+'''
+
+# Origins roughly over Amsterdam, so reprojection between the CRSs below stays well-behaved
+ORIGINS = {
+    'EPSG:28992': (120000.0, 490000.0),
+    'EPSG:3857': (540000.0, 6870000.0),
+    'EPSG:4326': (4.85, 52.40),
+}
+# Pixel size in the units of each CRS, roughly 10 m on the ground
+PIXEL_SIZES = {
+    'EPSG:28992': 10.0,
+    'EPSG:3857': 16.0,
+    'EPSG:4326': 0.00015,
+}
+
+# Class codes of UrbanLandUse as remapped in land_use
+LULC_CLASSES = [1, 2, 3, 10, 20, 30, 40, 41, 42, 43, 44, 50]
+
+
+def random_surface(size, seed=0, nan_fraction=0.05, low=0.0, high=1.0):
+    """
+    Generates a smooth random surface with NaN holes.
+
+    Args:
+    - size: Side length of the square array in pixels.
+    - seed: Seed for the random generator.
+    - nan_fraction: Fraction of pixels set to NaN.
+    - low, high: Value range of the surface.
+
+    Returns:
+    - 2D float32 array.
+    """
+    rng = np.random.default_rng(seed)
+    rows, cols = np.mgrid[0:size, 0:size] / max(size, 1)
+    surface = np.sin(rows * 6.0 + rng.uniform(0, np.pi)) * np.cos(cols * 4.0 + rng.uniform(0, np.pi))
+    surface += rng.normal(0, 0.25, (size, size))
+    surface = (surface - surface.min()) / (surface.max() - surface.min())
+    surface = (low + surface * (high - low)).astype(np.float32)
+    surface[rng.random((size, size)) < nan_fraction] = np.nan
+    return surface
+
+
+def synthetic_meta(size, crs='EPSG:28992'):
+    """
+    Metadata dict in the form returned by Align_ras.align_rasters.
+    """
+    origin_x, origin_y = ORIGINS[crs]
+    pixel_size = PIXEL_SIZES[crs]
+    return {
+        'driver': 'GTiff',
+        'dtype': 'float32',
+        'nodata': np.nan,
+        'width': size,
+        'height': size,
+        'count': 1,
+        'crs': rasterio.crs.CRS.from_user_input(crs),
+        'transform': from_origin(origin_x, origin_y, pixel_size, pixel_size),
+    }
+
+
+def write_raster(path, array, crs='EPSG:28992'):
+    """
+    Writes a single band array to a GeoTIFF on the synthetic grid of the given CRS.
+    """
+    meta = synthetic_meta(array.shape[0], crs)
+    meta.update({'dtype': array.dtype.name})
+    if not np.issubdtype(array.dtype, np.floating):
+        meta['nodata'] = None
+    with rasterio.open(path, 'w', **meta) as dst:
+        dst.write(array, 1)
+    return path
+
+
+def write_heat_rasters(folder, size, seed=0, crs=('EPSG:28992', 'EPSG:28992', 'EPSG:28992'), nan_fraction=0.05):
+    """
+    Writes LST, NDVI and tree height GeoTIFFs as inputs for align_rasters.
+
+    Args:
+    - folder: Output folder.
+    - size: Side length of each raster in pixels.
+    - seed: Seed for the random generator.
+    - crs: CRS of the LST, NDVI and tree height rasters.
+    - nan_fraction: Fraction of pixels set to NaN.
+
+    Returns:
+    - Paths of the LST, NDVI and tree height rasters.
+    """
+    os.makedirs(folder, exist_ok=True)
+    lst = random_surface(size, seed, nan_fraction, 290.0, 320.0)
+    ndvi = random_surface(size, seed + 1, nan_fraction, -0.2, 0.9)
+    tree = random_surface(size, seed + 2, nan_fraction, 0.0, 30.0)
+    return (write_raster(os.path.join(folder, f'lst_{size}.tif'), lst, crs[0]),
+            write_raster(os.path.join(folder, f'ndvi_{size}.tif'), ndvi, crs[1]),
+            write_raster(os.path.join(folder, f'tree_{size}.tif'), tree, crs[2]))
+
+
+def random_land_use(size, seed=0):
+    """
+    Generates an UrbanLandUse-like xarray.DataArray of class codes.
+    """
+    rng = np.random.default_rng(seed)
+    classes = rng.choice(LULC_CLASSES, size=(size, size)).astype(np.uint8)
+    origin_x, origin_y = ORIGINS['EPSG:28992']
+    pixel_size = PIXEL_SIZES['EPSG:28992']
+    return xr.DataArray(
+        classes,
+        dims=('y', 'x'),
+        coords={'y': origin_y - (np.arange(size) + 0.5) * pixel_size,
+                'x': origin_x + (np.arange(size) + 0.5) * pixel_size},
+    )
+
+
+def random_buildings(bounds, n_buildings, seed=0, crs='EPSG:28992', min_side=8.0, max_side=40.0):
+    """
+    Generates rectangular building footprints with an id and a height column.
+
+    Args:
+    - bounds: (xmin, ymin, xmax, ymax) the buildings are placed within.
+    - n_buildings: Number of footprints.
+    - seed: Seed for the random generator.
+    - crs: CRS of the footprints.
+    - min_side, max_side: Range of footprint side lengths in CRS units.
+
+    Returns:
+    - GeoDataFrame with 'id', 'height' and geometry columns.
+    """
+    rng = np.random.default_rng(seed)
+    xmin, ymin, xmax, ymax = bounds
+    widths = rng.uniform(min_side, max_side, n_buildings)
+    depths = rng.uniform(min_side, max_side, n_buildings)
+    xs = rng.uniform(xmin, xmax - widths)
+    ys = rng.uniform(ymin, ymax - depths)
+    geometries = [box(x, y, x + w, y + d) for x, y, w, d in zip(xs, ys, widths, depths)]
+    return gpd.GeoDataFrame({
+        'id': np.arange(n_buildings),
+        'height': rng.uniform(3.0, 60.0, n_buildings),
+    }, geometry=geometries, crs=crs)
+
+
+def write_buildings(path, bounds, n_buildings, seed=0, crs='EPSG:28992'):
+    """
+    Writes random building footprints to a GeoPackage.
+    """
+    random_buildings(bounds, n_buildings, seed, crs).to_file(path, layer='buildings', driver='GPKG')
+    return path
+
+
+def random_points(bounds, n_points, seed=0):
+    """
+    Generates x, y, z arrays and ASPRS classes for a synthetic point cloud.
+
+    Args:
+    - bounds: (xmin, ymin, xmax, ymax) of the cloud.
+    - n_points: Number of points.
+    - seed: Seed for the random generator.
+
+    Returns:
+    - x, y, z float64 arrays and a uint8 classification array.
+    """
+    rng = np.random.default_rng(seed)
+    xmin, ymin, xmax, ymax = bounds
+    x = rng.uniform(xmin, xmax, n_points)
+    y = rng.uniform(ymin, ymax, n_points)
+    z = rng.gamma(2.0, 5.0, n_points)
+    # Mostly ground (2), vegetation (3, 4, 5) and buildings (6)
+    classification = rng.choice([2, 3, 4, 5, 6], size=n_points, p=[0.4, 0.1, 0.1, 0.2, 0.2]).astype(np.uint8)
+    return x, y, z, classification
+
+
+def write_las(path, bounds, n_points, seed=0):
+    """
+    Writes a synthetic point cloud to a LAS file.
+    """
+    x, y, z, classification = random_points(bounds, n_points, seed)
+    header = laspy.LasHeader(point_format=3, version='1.2')
+    header.offsets = np.array([bounds[0], bounds[1], 0.0])
+    header.scales = np.array([0.001, 0.001, 0.001])
+    las = laspy.LasData(header)
+    las.x, las.y, las.z = x, y, z
+    las.classification = classification
+    las.write(path)
+    return path
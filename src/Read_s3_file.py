@@ -4,33 +4,39 @@ import boto3
 from io import StringIO
 from io import BytesIO
 
-key = pd.read_csv('F:/InternshipWRI/cities-data-user_accessKeys.csv')
-access_key = key['Access key ID'].iloc[0]
-secret_key = key['Secret access key'].iloc[0]
 
-# s3_client = boto3.client(
-#     's3',
-#     aws_access_key_id=access_key,
-#     aws_secret_access_key=secret_key
-# )
+def upload_to_s3(local_file_name, bucket_name, object_key, credentials_path):
+    key = pd.read_csv(credentials_path)
+    access_key = key['Access key ID'].iloc[0]
+    secret_key = key['Secret access key'].iloc[0]
 
-# data = StringIO()
-# city_Albedo.rio.to_raster(data)
-# data.seek(0)
+    # s3_client = boto3.client(
+    #     's3',
+    #     aws_access_key_id=access_key,
+    #     aws_secret_access_key=secret_key
+    # )
 
-bucket_name = 'wri-cities-heat'
-local_file_name = 'F:/InternshipWRI/Amsterdam_LST.tif'
+    # data = StringIO()
+    # city_Albedo.rio.to_raster(data)
+    # data.seek(0)
 
+    s3 = boto3.resource(service_name='s3',aws_access_key_id=access_key,aws_secret_access_key=secret_key)
 
-s3 = boto3.resource(service_name='s3',aws_access_key_id=access_key,aws_secret_access_key=secret_key)
+    s3.meta.client.upload_file(local_file_name,
+                                   bucket_name,
+                                   object_key,
+                                   ExtraArgs={'ACL':'public-read'})
 
-s3.meta.client.upload_file(local_file_name,
-                               bucket_name,
-                               'NLD-Amsterdam/Amsterdam_NDVI-test-upload.tif',
-                               ExtraArgs={'ACL':'public-read'})
+    # try:
+    #     s3_client.put_object(Bucket=bucket_name, Key=object_name, Body=data.getvalue())
+    #     print("File uploaded successfully.")
+    # except Exception as e:
+    #     print(f"Error uploading file: {e}")
 
-# try:
-#     s3_client.put_object(Bucket=bucket_name, Key=object_name, Body=data.getvalue())
-#     print("File uploaded successfully.")
-# except Exception as e:
-#     print(f"Error uploading file: {e}")
\ No newline at end of file
+
+if __name__ == "__main__":
+    bucket_name = 'wri-cities-heat'
+    local_file_name = 'F:/InternshipWRI/Amsterdam_LST.tif'
+
+    upload_to_s3(local_file_name, bucket_name, 'NLD-Amsterdam/Amsterdam_NDVI-test-upload.tif',
+                 'F:/InternshipWRI/cities-data-user_accessKeys.csv')
@@ -0,0 +1,124 @@
+import numpy as np
+from .instrumentation import instrument, stage
+
+
+def normalize(array, out=None):
+    """
+    Min-max normalizes the array to [0, 1], ignoring NaNs.
+
+    The result is float32 (absolute error below 1e-7) and is written into out when given, so a
+    buffer can be reused across layers.
+    """
+    if out is None:
+        out = np.empty(array.shape, dtype=np.float32)
+    min_val, max_val = np.nanmin(array), np.nanmax(array)
+    np.subtract(array, min_val, out=out, casting='unsafe')
+    np.divide(out, max_val - min_val, out=out, casting='unsafe')
+    return out
+
+
+def compute_heat_score(lst, ndvi, height, keep_layers=False):
+    """
+    Computes heat_score = lst_norm + (1 - ndvi_norm) + (1 - height_norm) in float32.
+
+    Args:
+    - lst, ndvi, height: Aligned raster arrays.
+    - keep_layers: Also return the normalized layers. Otherwise a single scratch buffer is reused
+      for them, so only two full-size float32 arrays are allocated.
+
+    Returns:
+    - heat_score: float32 array in [0, 3], absolute error below 5e-7.
+    - layers: Dict of the normalized layers, empty unless keep_layers is set.
+    """
+    heat_score = normalize(lst)
+    layers = {}
+    if keep_layers:
+        layers['lst_norm'] = heat_score.copy()
+
+    scratch = None
+    for name, array in (('ndvi_norm', ndvi), ('height_norm', height)):
+        scratch = normalize(array, out=None if keep_layers else scratch)
+        if keep_layers:
+            layers[name] = scratch
+        np.subtract(heat_score, scratch, out=heat_score)
+    heat_score += 2
+
+    return heat_score, layers
+
+
+def sliding_window_aggregate(array, window_size):
+    """
+    Apply a memory-efficient sliding window aggregation (mean) over the array.
+    """
+    rows, cols = array.shape
+    aggregated_result = np.zeros((rows - window_size + 1, cols - window_size + 1), dtype=np.float32)
+
+    with stage('sliding_window_aggregate', pixels=array.size, window_size=window_size):
+        for i in range(0, rows - window_size + 1):
+            for j in range(0, cols - window_size + 1):
+                window = array[i:i + window_size, j:j + window_size]
+                aggregated_result[i, j] = np.nanmean(window)
+
+    return aggregated_result
+
+
+@instrument()
+def identify_top_AOIs(lst, ndvi, height, metadata, top_n=3, target_km=2, output_folder=None, output_prefix='',
+                      output_int16=False):
+    """
+    Identifies the top non-overlapping 2km x 2km AOIs based on criteria.
+
+    If output_folder is given, the normalized layers, heat_score and the aggregated surface are
+    written there as COGs, and the AOIs as a single GeoPackage layer with their scores and ranks.
+    With output_int16 the COGs hold scaled int16 instead of float32 (absolute error at most 5e-5).
+    """
+    transform = metadata['transform']
+    pixel_size_x, pixel_size_y = transform[0], abs(transform[4])
+    window_size_x = int(target_km * 1000 / pixel_size_x)
+    window_size_y = int(target_km * 1000 / pixel_size_y)
+    window_size = min(window_size_x, window_size_y)
+
+    # Normalize and compute the criteria
+    with stage('heat_score', pixels=lst.size + ndvi.size + height.size):
+        heat_score, layers = compute_heat_score(lst, ndvi, height, keep_layers=output_folder is not None)
+
+    # Compute aggregated heat score
+    heat_aggregated = sliding_window_aggregate(heat_score, window_size)
+
+    if output_folder is not None:
+        # Imported here so scoring alone does not pay for rasterio and geopandas
+        from .export_outputs import write_heat_surfaces
+        from .create_gpkg import create_gpkg_from_aois
+
+        # Written before the AOI search below masks the aggregated surface
+        write_heat_surfaces(output_folder, metadata, window_size, prefix=output_prefix, as_int16=output_int16,
+                            heat_score=heat_score, heat_aggregated=heat_aggregated, **layers)
+
+    top_AOIs = []
+    for rank in range(1, top_n + 1):
+        # Every remaining window overlaps an AOI found before
+        if np.all(np.isnan(heat_aggregated)):
+            break
+
+        max_idx = np.nanargmax(heat_aggregated)
+        # The aggregate index is the pixel row and column of the window's top-left corner
+        max_row, max_col = np.unravel_index(max_idx, heat_aggregated.shape)
+        score = float(heat_aggregated[max_row, max_col])
+
+        # Convert to map coordinates
+        top_left = transform * (max_col, max_row)
+        bottom_right = transform * (max_col + window_size, max_row + window_size)
+        top_AOIs.append({"top_left": top_left, "bottom_right": bottom_right, "score": score, "rank": rank})
+
+        # Set every window overlapping the identified one to nan to avoid overlap
+        heat_aggregated[max(max_row - window_size + 1, 0):max_row + window_size,
+                        max(max_col - window_size + 1, 0):max_col + window_size] = np.nan
+
+    print(top_AOIs)
+
+    if output_folder is not None:
+        create_gpkg_from_aois(top_AOIs, metadata['crs'], output_folder, f'{output_prefix}top_aois.gpkg')
+
+    return top_AOIs
+
+
@@ -0,0 +1,141 @@
+import rasterio
+from rasterio.transform import array_bounds
+from rasterio.warp import calculate_default_transform, reproject, Resampling
+import numpy as np
+from .instrumentation import instrument, stage
+
+@instrument()
+def align_rasters(lst_raster_path, ndvi_raster_path, tree_height_raster_path, target_crs='EPSG:28992', output_resolution=(10, 10)):
+    """
+    Aligns LST, NDVI, and Tree Height rasters to have the same CRS, bounding box, and resolution.
+
+    The rasters are read as float32 and processed one at a time, each warped in a single pass
+    from its own CRS straight onto the aligned grid, so besides the aligned outputs only one
+    source array is held in memory at once.
+
+    Args:
+    - lst_raster_path: Path to the LST raster file.
+    - ndvi_raster_path: Path to the NDVI raster file.
+    - tree_height_raster_path: Path to the tree height raster file.
+    - target_crs: The target coordinate reference system, default 'EPSG:28992'.
+    - output_resolution: Tuple for resolution in meters (default is 10m x 10m).
+
+    Returns:
+    - lst_aligned, ndvi_aligned, tree_height_aligned: Aligned float32 raster arrays.
+    - meta: Metadata of the aligned rasters.
+    """
+    # Open the rasters
+    with rasterio.open(lst_raster_path) as lst, rasterio.open(ndvi_raster_path) as ndvi, rasterio.open(tree_height_raster_path) as tree:
+        sources = (lst, ndvi, tree)
+
+        # Transforms and dimensions in the target CRS, computed from the headers before any data is
+        # read; only used for the extent of the aligned grid
+        (lst_transform, lst_width, lst_height), (ndvi_transform, ndvi_width, ndvi_height), (tree_transform, tree_width, tree_height) = [
+            (src.transform, src.width, src.height) if src.crs == target_crs
+            else target_transform(src.transform, src.crs, target_crs, src.width, src.height)
+            for src in sources
+        ]
+
+        # Calculate the intersection of the bounding boxes
+        min_x = max(lst_transform[2], ndvi_transform[2], tree_transform[2])
+        max_x = min(lst_transform[2] + lst_width * lst_transform[0],
+                    ndvi_transform[2] + ndvi_width * ndvi_transform[0],
+                    tree_transform[2] + tree_width * tree_transform[0])
+
+        min_y = max(lst_transform[5] + lst_height * lst_transform[4],
+                    ndvi_transform[5] + ndvi_height * ndvi_transform[4],
+                    tree_transform[5] + tree_height * tree_transform[4])
+
+        max_y = min(lst_transform[5], ndvi_transform[5], tree_transform[5])
+
+        # Calculate new dimensions and transform
+        new_width = int((max_x - min_x) / output_resolution[0])
+        new_height = int((max_y - min_y) / output_resolution[1])
+        new_transform = rasterio.transform.from_origin(min_x, max_y, output_resolution[0], output_resolution[1])
+
+        # Prepare metadata for aligned rasters
+        meta = lst.meta.copy()
+        meta.update({
+            'driver': 'GTiff',
+            'dtype': 'float32',
+            'nodata': np.nan,
+            'height': new_height,
+            'width': new_width,
+            'transform': new_transform,
+            'crs': target_crs
+        })
+
+        # Reproject and resample each raster to match the new resolution and bounding box
+        aligned = []
+        for src in sources:
+            with stage('read_raster') as timing:
+                data = src.read(1, out_dtype='float32')
+                timing.add(pixels=data.size, bytes_read=data.nbytes)
+            if src.nodata is not None and not np.isnan(src.nodata):
+                data[data == src.nodata] = np.nan
+
+            # Reproject (if the CRS do not match) and resample in one pass, without an intermediate
+            # copy in the target CRS and with a single bilinear interpolation.
+            # Cells the source does not cover stay NaN rather than 0
+            aligned_data = np.full((new_height, new_width), np.nan, dtype='float32')
+            with stage('resample_to_grid', pixels=aligned_data.size):
+                reproject(source=data, destination=aligned_data, src_transform=src.transform, src_crs=src.crs, dst_transform=new_transform, dst_crs=target_crs,
+                          src_nodata=np.nan, dst_nodata=np.nan, resampling=Resampling.bilinear)
+            # Release the source before the next raster is read
+            del data
+            aligned.append(aligned_data)
+
+    lst_aligned, ndvi_aligned, tree_aligned = aligned
+    return lst_aligned, ndvi_aligned, tree_aligned, meta
+
+def target_transform(src_transform, src_crs, dst_crs, width, height):
+    """
+    Helper function to calculate the transform and dimensions of a raster in a new CRS.
+
+    Returns:
+    - transform, width, height in the destination CRS.
+    """
+    # Ensure CRS is properly parsed
+    src_crs = rasterio.crs.CRS.from_user_input(src_crs)
+    dst_crs = rasterio.crs.CRS.from_user_input(dst_crs)
+
+    return calculate_default_transform(
+        src_crs, dst_crs, width, height, *array_bounds(height, width, src_transform))
+
+def reproject_array(data, src_transform, src_crs, dst_crs, width, height):
+    """
+    Helper function to reproject array to a new CRS.
+
+    Args:
+    - data: The source data array.
+    - src_transform: Source affine transformation.
+    - src_crs: Source coordinate reference system.
+    - dst_crs: Destination coordinate reference system.
+    - width: Width of the source data.
+    - height: Height of the source data.
+
+    Returns:
+    - data: Reprojected data array, in the dtype of the source.
+    - transform: New affine transformation.
+    """
+    # Calculate the new transform and dimensions
+    new_transform, new_width, new_height = target_transform(src_transform, src_crs, dst_crs, width, height)
+    # Float rasters use NaN for the cells outside the source
+    nodata = np.nan if np.issubdtype(data.dtype, np.floating) else None
+    new_data = np.full((new_height, new_width), nodata if nodata is not None else 0, dtype=data.dtype)
+
+    # Reproject the data
+    with stage('reproject_array', pixels=new_data.size):
+        reproject(
+            source=data,
+            destination=new_data,
+            src_transform=src_transform,
+            src_crs=rasterio.crs.CRS.from_user_input(src_crs),
+            dst_transform=new_transform,
+            dst_crs=rasterio.crs.CRS.from_user_input(dst_crs),
+            src_nodata=nodata,
+            dst_nodata=nodata,
+            resampling=Resampling.bilinear
+        )
+
+    return new_data, new_transform
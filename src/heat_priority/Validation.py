@@ -0,0 +1,213 @@
+import geopandas as gpd
+import rasterio
+from rasterio.windows import Window
+from shapely.geometry import Point, box
+from rtree import index
+import numpy as np
+from .instrumentation import instrument, stage
+from .raster_stack import is_stack, open_stack, window_slices
+from .footprint_store import FootprintStore
+
+'''
+The CRS is EPSG:28992 for better results locally (for Amsterdam), the unit in this CRS is meter.
+'''
+# Define the Stats class to store statistics for each building
+
+# Define the Stats class to store statistics
+class Stats:
+    def __init__(self, max_val, min_val, avg_val, stddev_val, num_points, avg_diff):
+        self.max_val = max_val
+        self.min_val = min_val
+        self.avg_val = avg_val
+        self.stddev_val = stddev_val
+        self.num_points = num_points
+        self.avg_diff = avg_diff  # Difference between average cell height and building height
+
+    def __str__(self):
+        return (f"Max: {self.max_val}, Min: {self.min_val}, Avg: {self.avg_val}, "
+                f"Stddev: {self.stddev_val}, Points: {self.num_points}, Avg Diff: {self.avg_diff}")
+
+# Function to create a 2km bounding box given a center point in EPSG:28992
+def create_2km_bbox(center_x, center_y):
+    half_size = 1000  # 1km in each direction for a 2km x 2km bounding box
+    xmin = center_x - half_size
+    xmax = center_x + half_size
+    ymin = center_y - half_size
+    ymax = center_y + half_size
+    return box(xmin, ymin, xmax, ymax)
+
+# Function to calculate statistics for cell heights inside a polygon
+def calculate_height_stats(cell_heights, building_height):
+    avg_height = np.mean(cell_heights)
+    stats = Stats(
+        max_val=np.max(cell_heights),
+        min_val=np.min(cell_heights),
+        avg_val=avg_height,
+        stddev_val=np.std(cell_heights),
+        num_points=len(cell_heights),
+        avg_diff=avg_height - building_height  # Difference between avg height of cells and building height
+    )
+    return stats
+
+# generate the center points and height values of each raster cell, or only of the cells
+# intersecting bounds (xmin, ymin, xmax, ymax) if given
+def generate_cell_centers_and_heights(raster_path, bounds=None):
+    # Open the raster file
+    with rasterio.open(raster_path) as src:
+        if bounds is None:
+            with stage('read_raster') as timing:
+                raster_data = src.read(1)  # Read the first band for height data (assuming DSM or CHM)
+                timing.add(pixels=raster_data.size, bytes_read=raster_data.nbytes)
+            return cell_centers_and_heights_from_array(raster_data, src.transform)
+
+        # Read only the window over bounds
+        row_slice, col_slice = window_slices(src.transform, src.height, src.width, bounds)
+        window = Window.from_slices(row_slice, col_slice)
+        if window.width == 0 or window.height == 0:
+            return []
+        with stage('read_raster') as timing:
+            raster_data = src.read(1, window=window)
+            timing.add(pixels=raster_data.size, bytes_read=raster_data.nbytes)
+        return cell_centers_and_heights_from_array(raster_data, src.window_transform(window))
+
+# generate the center points and height values of each cell of an array, e.g. a window of a raster stack
+def cell_centers_and_heights_from_array(raster_data, transform):
+    raster_height, raster_width = raster_data.shape
+    with stage('generate_cell_centers_and_heights', pixels=raster_data.size):
+        cell_centers_and_heights = []
+
+        # Loop over the rows and columns of the raster to get the center points and heights
+        for row in range(raster_height):
+            for col in range(raster_width):
+                x, y = rasterio.transform.xy(transform, row, col, offset='center')
+                height = raster_data[row, col]  # Get the height value from the raster
+                cell_centers_and_heights.append((Point(x, y), height))  # Store center point and height
+
+    return cell_centers_and_heights
+
+# Function to build an R-tree spatial index for fast lookups
+def build_spatial_index(cell_centers_and_heights):
+    idx = index.Index()
+    with stage('build_spatial_index', points=len(cell_centers_and_heights)):
+        for i, (point, height) in enumerate(cell_centers_and_heights):
+            idx.insert(i, (point.x, point.y, point.x, point.y))  # Insert point's bounding box into the index
+    return idx
+
+# Function to find points inside a polygon using R-tree spatial index. The number of candidate
+# points is added to timing, the stage of the calling loop, if given.
+def points_in_polygon(polygon, cell_centers_and_heights, spatial_idx, timing=None):
+    candidates = list(spatial_idx.intersection(polygon.bounds))  # Get candidate points by bounding box
+    points_within_polygon = [(cell_centers_and_heights[i][0], cell_centers_and_heights[i][1]) for i in candidates if polygon.contains(cell_centers_and_heights[i][0])]  # Exact check
+    if timing is not None:
+        timing.add(points=len(candidates))
+    return points_within_polygon
+
+# Function to process each building and calculate statistics for points inside the polygon
+# Only the window of the raster over bbox and the selected buildings is read. raster_path can
+# also be a raster stack (see raster_stack.py). vector_path can also be a FootprintStore, which is queried
+# instead of reading the file.
+@instrument()
+def process_buildings(raster_path, vector_path, bbox, band=None):
+    # Load the vector data (building footprints) from geopackage
+    if isinstance(vector_path, FootprintStore):
+        buildings_gdf = vector_path.query(bbox)
+    else:
+        with stage('read_buildings') as timing:
+            buildings_gdf = gpd.read_file(vector_path, bbox=bbox)
+            timing.add(features=len(buildings_gdf))
+
+    return calculate_building_stats(raster_path, buildings_gdf, bbox, band)
+
+# Function to validate many AOIs against a building layer that is read only once. The raster
+# is read one window per AOI.
+def process_many_AOIs(raster_path, vector_path, bboxes, band=None, index_path=None):
+    # Load the building footprints once, or reuse the store persisted at index_path
+    if isinstance(vector_path, FootprintStore):
+        footprints = vector_path
+    else:
+        footprints = FootprintStore.load_or_build(vector_path, index_path)
+
+    # Select the buildings of all AOIs in one batched query
+    buildings_per_aoi = footprints.query_many(bboxes)
+
+    return [calculate_building_stats(raster_path, buildings_gdf, bbox, band)
+            for buildings_gdf, bbox in zip(buildings_per_aoi, bboxes)]
+
+# Function to get the bounds covering bbox and the buildings, which may cross its edge
+def building_bounds(buildings_gdf, bbox):
+    xmin, ymin, xmax, ymax = bbox.bounds if hasattr(bbox, 'bounds') else bbox
+    if len(buildings_gdf):
+        bxmin, bymin, bxmax, bymax = buildings_gdf.total_bounds
+        xmin, ymin, xmax, ymax = min(xmin, bxmin), min(ymin, bymin), max(xmax, bxmax), max(ymax, bymax)
+    return xmin, ymin, xmax, ymax
+
+# Function to calculate statistics of the buildings within bbox
+def calculate_building_stats(raster_path, buildings_gdf, bbox, band=None):
+    # Generate cell centers and heights from the raster
+    # Read the window over the whole buildings, not just their part within bbox
+    bounds = building_bounds(buildings_gdf, bbox)
+    if is_stack(raster_path):
+        stack = open_stack(raster_path)
+        raster_data, transform = stack.read_window(band or stack.band_names[0], bounds)
+        # Copy the window out of the memory map, so its pages are read here and not in the loop below
+        with stage('read_raster') as timing:
+            raster_data = np.array(raster_data)
+            timing.add(pixels=raster_data.size, bytes_read=raster_data.nbytes)
+        cell_centers_and_heights = cell_centers_and_heights_from_array(raster_data, transform)
+    else:
+        cell_centers_and_heights = generate_cell_centers_and_heights(raster_path, bounds)
+
+    # Build the spatial index for all cell centers
+    spatial_idx = build_spatial_index(cell_centers_and_heights)
+
+    # Store building stats in a dictionary
+    building_stats = {}
+
+    # Lists to store differences for overall performance
+    all_diffs = []
+
+    # Loop through each building polygon in the vector file, timed as one stage for all buildings
+    with stage('points_in_polygon', features=len(buildings_gdf)) as timing:
+        for idx, building in buildings_gdf.iterrows():
+            building_polygon = building.geometry
+            building_height = building['height']  # Assuming 'height' is the column name
+
+            # Find the cell centers inside the building polygon
+            points_in_poly = points_in_polygon(building_polygon, cell_centers_and_heights, spatial_idx, timing)
+
+            # Collect heights for the points within the polygon
+            cell_heights = [height for point, height in points_in_poly]
+
+            # Calculate stats if there are any points in the polygon
+            if cell_heights:
+                stats = calculate_height_stats(cell_heights, building_height)
+                building_stats[building['id']] = stats  # Use building ID as key
+
+                # Append the difference to the overall performance list
+                all_diffs.append(stats.avg_diff)
+
+    # Calculate overall performance
+    avg_diff = np.mean(all_diffs) if all_diffs else 0
+    stddev_diff = np.std(all_diffs) if all_diffs else 0
+
+    return building_stats, avg_diff, stddev_diff
+
+if __name__ == "__main__":
+    # Example usage
+    raster_path = 'path_to_raster_file_on_local_machine_or_server'
+    vector_path = 'path_to_geopackage.gpkg'
+
+    # Example center point for bounding box (in EPSG:28992)
+    center_x, center_y = 155000, 463000
+    bbox = create_2km_bbox(center_x, center_y)
+
+    # Process the buildings and get the stats for each footprint along with overall performance
+    building_stats, avg_diff, stddev_diff = process_buildings(raster_path, vector_path, bbox)
+
+    # Output the stats for each building
+    for building_id, stats in building_stats.items():
+        print(f"Building ID: {building_id}, Stats: {stats}")
+
+    # Print overall performance summary
+    print(f"\nOverall Average Height Difference: {avg_diff}")
+    print(f"Overall Stddev of Height Differences: {stddev_diff}")
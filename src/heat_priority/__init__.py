@@ -0,0 +1,6 @@
+'''
+Heat priority area pipeline: align and score heat rasters, identify AOIs, validate building
+heights and prepare SOLWEIG inputs.
+
+Submodules are not imported here, so that importing one step does not pay for the others.
+'''
@@ -0,0 +1,190 @@
+import argparse
+import os
+import sys
+
+'''
+Command line entry point of the pipeline.
+
+Only argparse is imported up front; each subcommand imports the modules and heavy dependencies
+(rasterio, geopandas, laspy, city_metrix) it needs when it runs, so that a job running one
+step starts in a fraction of a second.
+
+    heat-priority align LST.tif NDVI.tif CanopyHeight.tif --output-folder aligned --stack aligned/stack.npy
+    heat-priority score aligned/lst_aligned.tif aligned/ndvi_aligned.tif aligned/tree_aligned.tif --output-folder out
+    heat-priority score aligned/stack.npy --output-folder out
+    heat-priority validate DSM.tif buildings.gpkg --center 155000 463000
+    heat-priority validate DSM.tif buildings.gpkg --aois out/top_aois.gpkg --index buildings.index
+    heat-priority rasterize-lidar points.las vegetation.tif --bbox 181437 318805 181937 319305
+    heat-priority build-solweig-inputs data/ba_roi.geojson --aoi-name ba_roi
+
+Add --trace run.jsonl (or run.trace.json for a Chrome trace) before the subcommand to record
+stage timings.
+'''
+
+
+def align(args):
+    from .Align_ras import align_rasters
+    from .export_outputs import write_cog
+
+    lst_aligned, ndvi_aligned, tree_aligned, meta = align_rasters(
+        args.lst, args.ndvi, args.tree_height, args.crs, tuple(args.resolution))
+
+    os.makedirs(args.output_folder, exist_ok=True)
+    for name, array in (('lst', lst_aligned), ('ndvi', ndvi_aligned), ('tree', tree_aligned)):
+        output_path = os.path.join(args.output_folder, f'{name}_aligned.tif')
+        write_cog(array, meta, output_path)
+        print(f'File saved to {output_path}')
+
+    if args.stack:
+        from .raster_stack import write_stack
+
+        write_stack(args.stack, meta, lst=lst_aligned, ndvi=ndvi_aligned, tree=tree_aligned)
+        print(f'Stack saved to {args.stack}')
+
+
+def score(args):
+    from .AOI_identify import identify_top_AOIs
+
+    if len(args.rasters) == 1:
+        from .raster_stack import open_stack
+
+        stack = open_stack(args.rasters[0])
+        metadata = stack.metadata
+        lst_data, ndvi_data, tree_data = stack['lst'], stack['ndvi'], stack['tree']
+    elif len(args.rasters) == 3:
+        import rasterio
+
+        lst_path, ndvi_path, tree_path = args.rasters
+        with rasterio.open(lst_path) as lst, rasterio.open(ndvi_path) as ndvi, rasterio.open(tree_path) as tree:
+            metadata = lst.meta.copy()
+            lst_data, ndvi_data, tree_data = lst.read(1), ndvi.read(1), tree.read(1)
+    else:
+        raise SystemExit('score takes either a raster stack or the LST, NDVI and tree height rasters')
+
+    identify_top_AOIs(lst_data, ndvi_data, tree_data, metadata, top_n=args.top_n, target_km=args.target_km,
+                      output_folder=args.output_folder, output_prefix=args.prefix, output_int16=args.int16)
+
+
+def validate(args):
+    from shapely.geometry import box
+    from .Validation import create_2km_bbox, process_buildings, process_many_AOIs
+
+    if args.aois is not None:
+        import geopandas as gpd
+
+        # All AOIs are validated against a single read of the building layer
+        aois = gpd.read_file(args.aois).geometry.tolist()
+        results = process_many_AOIs(args.raster, args.buildings, aois, band=args.band, index_path=args.index)
+        for i, (building_stats, avg_diff, stddev_diff) in enumerate(results):
+            print(f"AOI {i}: Buildings validated: {len(building_stats)}, "
+                  f"Average Height Difference: {avg_diff}, Stddev of Height Differences: {stddev_diff}")
+        return
+
+    if args.bbox is not None:
+        bbox = box(*args.bbox)
+    else:
+        bbox = create_2km_bbox(*args.center)
+
+    if args.index is not None:
+        from .footprint_store import FootprintStore
+
+        buildings = FootprintStore.load_or_build(args.buildings, args.index)
+    else:
+        buildings = args.buildings
+
+    building_stats, avg_diff, stddev_diff = process_buildings(args.raster, buildings, bbox, band=args.band)
+
+    if args.verbose:
+        for building_id, stats in building_stats.items():
+            print(f"Building ID: {building_id}, Stats: {stats}")
+    print(f"Buildings validated: {len(building_stats)}")
+    print(f"Overall Average Height Difference: {avg_diff}")
+    print(f"Overall Stddev of Height Differences: {stddev_diff}")
+
+
+def rasterize_lidar(args):
+    import laspy
+    import numpy as np
+    from .write_to_raster import densify_points, grid_max_height, write_height_raster
+
+    las = laspy.read(args.las)
+    filtered_points = las.points[np.isin(las.classification, args.classes)]
+
+    densified_points = densify_points(filtered_points.x, filtered_points.y, filtered_points.z, radius=args.radius)
+    heights, transform = grid_max_height(densified_points, *args.bbox, cell_size=args.cell_size)
+    write_height_raster(heights, transform, args.output, crs=args.crs)
+    print(f"vegetation raster saved to: {args.output}")
+
+
+def build_solweig_inputs(args):
+    from . import solweig_inputs
+
+    solweig_inputs.main(args.aoi_url, args.aoi_name)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='heat-priority', description='Heat priority area pipeline.')
+    parser.add_argument('--trace', help='Record stage timings to this path (.json for a Chrome trace, else JSON lines).')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p = subparsers.add_parser('align', help='Align LST, NDVI and tree height rasters to one grid.')
+    p.add_argument('lst')
+    p.add_argument('ndvi')
+    p.add_argument('tree_height')
+    p.add_argument('--crs', default='EPSG:28992')
+    p.add_argument('--resolution', type=float, nargs=2, default=(10, 10), metavar=('X', 'Y'))
+    p.add_argument('--output-folder', required=True)
+    p.add_argument('--stack', help='Also write the aligned layers as a memory-mapped stack to this .npy path.')
+    p.set_defaults(func=align)
+
+    p = subparsers.add_parser('score', help='Score aligned rasters and identify the top AOIs.')
+    p.add_argument('rasters', nargs='+', help='Aligned LST, NDVI and tree height rasters, or a raster stack.')
+    p.add_argument('--top-n', type=int, default=3)
+    p.add_argument('--target-km', type=float, default=2)
+    p.add_argument('--output-folder', help='Write the heat surfaces as COGs and the AOIs as a GeoPackage here.')
+    p.add_argument('--prefix', default='', help='Prefix of the output file names.')
+    p.add_argument('--int16', action='store_true', help='Write the heat surfaces as scaled int16 instead of float32.')
+    p.set_defaults(func=score)
+
+    p = subparsers.add_parser('validate', help='Compare a height raster with building footprint heights.')
+    p.add_argument('raster', help='Height raster or raster stack.')
+    p.add_argument('buildings')
+    p.add_argument('--band', help='Band of the raster stack to validate (default: the first).')
+    area = p.add_mutually_exclusive_group(required=True)
+    area.add_argument('--center', type=float, nargs=2, metavar=('X', 'Y'), help='Center of a 2km box.')
+    area.add_argument('--bbox', type=float, nargs=4, metavar=('XMIN', 'YMIN', 'XMAX', 'YMAX'))
+    area.add_argument('--aois', help='Vector file of AOI polygons to validate, e.g. the top_aois.gpkg of score.')
+    p.add_argument('--index', help='Footprint index path, built from the buildings on first use and reused after '
+                        '(saved as <index>.parquet or <index>.fgb with a <index>.json sidecar).')
+    p.add_argument('--verbose', action='store_true', help='Print the stats of every building.')
+    p.set_defaults(func=validate)
+
+    p = subparsers.add_parser('rasterize-lidar', help='Grid the max height of LiDAR points into a raster.')
+    p.add_argument('las')
+    p.add_argument('output')
+    p.add_argument('--bbox', type=float, nargs=4, required=True, metavar=('XMIN', 'YMIN', 'XMAX', 'YMAX'))
+    p.add_argument('--cell-size', type=float, default=1)
+    p.add_argument('--classes', type=int, nargs='+', default=[3, 4, 5], help='ASPRS classes to keep.')
+    p.add_argument('--radius', type=float, default=0.20, help='Densification radius.')
+    p.add_argument('--crs', default='EPSG:7415')
+    p.set_defaults(func=rasterize_lidar)
+
+    p = subparsers.add_parser('build-solweig-inputs', help='Fetch and prepare the SOLWEIG input layers.')
+    p.add_argument('aoi_url', help='Polygon file of the area of interest.')
+    p.add_argument('--aoi-name', required=True)
+    p.set_defaults(func=build_solweig_inputs)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace:
+        from . import instrumentation
+        instrumentation.enable(args.trace)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import geopandas as gpd
+from shapely.geometry import box
+import os
+
+
+def create_gpkg_from_bbox(xmin, ymin, xmax, ymax, output_folder, output_filename, layer_name='bbox_layer'):
+    # Define the bounding box
+    bbox = box(xmin, ymin, xmax, ymax)
+
+    # Create a GeoDataFrame
+    gdf = gpd.GeoDataFrame({'geometry': [bbox]}, crs='EPSG:28992')
+
+    # Construct full output path
+    output_path = os.path.join(output_folder, output_filename)
+
+    # Write to GeoPackage
+    gdf.to_file(output_path, layer=layer_name, driver="GPKG")
+
+
+def create_gpkg_from_aois(top_AOIs, crs, output_folder, output_filename, layer_name='top_aois'):
+    """
+    Writes all AOIs of a run to a single GeoPackage layer in one bulk write.
+
+    Args:
+    - top_AOIs: AOI dicts as returned by identify_top_AOIs, with 'top_left', 'bottom_right',
+      'score' and 'rank' keys.
+    - crs: CRS of the AOI coordinates.
+    - output_folder: Output folder.
+    - output_filename: Name of the GeoPackage.
+    - layer_name: Name of the layer, replaced if it already exists.
+
+    Returns:
+    - Path of the GeoPackage.
+    """
+    geometries = []
+    for aoi in top_AOIs:
+        (x1, y1), (x2, y2) = aoi['top_left'], aoi['bottom_right']
+        geometries.append(box(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+
+    gdf = gpd.GeoDataFrame({
+        'rank': [aoi.get('rank') for aoi in top_AOIs],
+        'score': [aoi.get('score') for aoi in top_AOIs],
+    }, geometry=geometries, crs=crs)
+
+    os.makedirs(output_folder, exist_ok=True)
+    output_path = os.path.join(output_folder, output_filename)
+
+    # A single to_file call writes every feature within one transaction
+    gdf.to_file(output_path, layer=layer_name, driver="GPKG")
+    print(f'File saved to {output_path}')
+    return output_path
+
+
+if __name__ == "__main__":
+    # Parameters for the bounding box
+    xmin = 1603940.0007625178
+    ymin = 8477385.865001518
+    xmax = 1605940.0007625178
+    ymax = 8479385.865001518
+
+    # xmin = 1605940.0007625178
+    # ymin = 8479385.865001518
+    # xmax = 1607940.0007625178
+    # ymax = 8481385.865001518
+    output_folder = '../data'  # Relative path from the /src folder to the /data folder
+    output_filename = 'AOI2_bbx.gpkg'
+
+    # {'top_left': (1603940.0007625178, 8477385.865001518), 'bottom_right': (1605940.0007625178, 8479385.865001518)},
+    #1605940.0007625178, 8479385.865001518), 'bottom_right': (1607940.0007625178, 8481385.865001518)
+    # Create the GeoPackage
+    create_gpkg_from_bbox(xmin, ymin, xmax, ymax, output_folder, output_filename)
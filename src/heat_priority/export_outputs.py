@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import rasterio
+import rasterio.shutil
+from affine import Affine
+from rasterio.io import MemoryFile
+
+from .instrumentation import stage
+
+
+# Scale of the heat layers when written as int16: values in [0, 3] are kept to within 5e-5 (scale / 2)
+HEAT_INT16_SCALE = 1e-4
+INT16_NODATA = -32768
+
+
+def quantize_int16(array, scale, offset=0.0):
+    """
+    Scales a float array to int16 as round((array - offset) / scale), with NaN as INT16_NODATA.
+
+    Values are recovered as int16 * scale + offset (in float64) with an absolute error of at most
+    scale / 2, for values within offset + scale * [-32767, 32767]. The scaling runs in float64, since
+    in float32 the rounding of the subtraction and division alone can push the error past scale / 2.
+    """
+    scaled = np.subtract(array, offset, dtype=np.float64)
+    scaled /= scale
+    np.rint(scaled, out=scaled)
+    np.clip(scaled, -32767, 32767, out=scaled)
+    # NaN is replaced before the cast, which is undefined for NaN and warns
+    scaled[np.isnan(scaled)] = INT16_NODATA
+    return scaled.astype(np.int16)
+
+
+def write_cog(array, metadata, output_path, blocksize=512, compress='DEFLATE', overview_resampling='average',
+              scale=None, offset=0.0):
+    """
+    Writes a single band array as a tiled, compressed Cloud-Optimized GeoTIFF with overviews.
+
+    Args:
+    - array: 2D array to write. NaN is written as nodata for float arrays.
+    - metadata: Raster metadata holding at least 'crs' and 'transform'.
+    - output_path: Path of the COG.
+    - blocksize: Tile size in pixels.
+    - compress: GDAL compression, e.g. 'DEFLATE', 'ZSTD' or 'LZW'.
+    - overview_resampling: Resampling used to build the overviews.
+    - scale, offset: If scale is given, the array is stored as int16 with this scale and offset
+      (see quantize_int16), which readers apply through the band scale/offset tags.
+    """
+    nodata = np.nan if np.issubdtype(array.dtype, np.floating) else None
+    if scale is not None:
+        array = quantize_int16(array, scale, offset)
+        nodata = INT16_NODATA
+
+    profile = {
+        'driver': 'GTiff',
+        'height': array.shape[0],
+        'width': array.shape[1],
+        'count': 1,
+        'dtype': array.dtype.name,
+        'crs': metadata['crs'],
+        'transform': metadata['transform'],
+        'nodata': nodata,
+    }
+    # Floating point predictor for float layers, horizontal differencing for integer layers
+    predictor = 3 if np.issubdtype(array.dtype, np.floating) else 2
+
+    with stage('write_cog', pixels=array.size, path=output_path):
+        # The COG driver can only copy an existing dataset, so the array goes through memory first
+        with MemoryFile() as memfile:
+            with memfile.open(**profile) as tmp:
+                tmp.write(array, 1)
+                if scale is not None:
+                    tmp.scales = (scale,)
+                    tmp.offsets = (offset,)
+                rasterio.shutil.copy(tmp, output_path, driver='COG', blocksize=blocksize, compress=compress,
+                                     predictor=predictor, overviews='AUTO', overview_resampling=overview_resampling,
+                                     bigtiff='IF_SAFER')
+    return output_path
+
+
+def aggregated_transform(transform, window_size):
+    """
+    Transform of a sliding window aggregate, placing each value at the center of its window.
+    """
+    offset = (window_size - 1) / 2
+    return transform * Affine.translation(offset, offset)
+
+
+def write_heat_surfaces(output_folder, metadata, window_size, prefix='', as_int16=False, **layers):
+    """
+    Writes the heat layers of a run as COGs.
+
+    Args:
+    - output_folder: Folder of the COGs.
+    - metadata: Metadata of the aligned rasters.
+    - window_size: Window size of the aggregation, in pixels.
+    - prefix: Prefix of the file names, e.g. the city name.
+    - as_int16: Store the layers as int16 scaled by HEAT_INT16_SCALE instead of float32, halving
+      their size. Only for the normalized layers and heat scores, which lie in [0, 3].
+    - layers: Arrays to write, keyed by name. A layer named 'heat_aggregated' is written on the
+      grid of the sliding window aggregate, the others on the aligned grid.
+
+    Returns:
+    - Dict of the written paths keyed by layer name.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    aggregated_meta = dict(metadata, transform=aggregated_transform(metadata['transform'], window_size))
+
+    paths = {}
+    for name, array in layers.items():
+        meta = aggregated_meta if name == 'heat_aggregated' else metadata
+        output_path = os.path.join(output_folder, f'{prefix}{name}.tif')
+        paths[name] = write_cog(array, meta, output_path, scale=HEAT_INT16_SCALE if as_int16 else None)
+        print(f'File saved to {output_path}')
+    return paths
@@ -0,0 +1,185 @@
+import importlib.util
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+from shapely import STRtree
+from shapely.geometry import box
+
+from .instrumentation import stage
+
+# Checked without importing pyarrow, which is slow to import
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+'''
+In-memory building footprint store for validating many AOIs against the same building layer.
+
+The layer is read once in bulk (pyogrio, through Arrow when pyarrow is installed) into a
+GeoDataFrame with an STRtree over its geometries. Bbox or polygon queries, one at a time or in
+vectorized batches, then replace the per-AOI gpd.read_file(vector_path, bbox=bbox) calls.
+
+The store can be saved so later sessions skip reparsing the source layer: the buildings as
+GeoParquet (<index_path>.parquet) when pyarrow is installed, else as FlatGeobuf
+(<index_path>.fgb), plus a JSON sidecar (<index_path>.json) recording the source they were read
+from and the format. The sidecar is checked before the
+buildings are read, and neither file holds executable data. The STRtree is rebuilt from the
+stored geometries on load, which is fast compared to the read.
+'''
+
+
+def sidecar_path(index_path):
+    return f'{index_path}.json'
+
+
+def data_path(index_path, fmt):
+    return f'{index_path}.{fmt}'
+
+
+def _as_geometry(area):
+    # Accepts shapely geometries and (xmin, ymin, xmax, ymax) tuples, like the bbox of gpd.read_file
+    if hasattr(area, 'geom_type'):
+        return area
+    return box(*area)
+
+
+class FootprintStore:
+    """
+    Building footprints with a spatial index answering bbox and polygon queries.
+    """
+    def __init__(self, buildings_gdf, source_path=None, source_mtime=None, layer=None, source_size=None):
+        self.buildings = buildings_gdf.reset_index(drop=True)
+        self.tree = STRtree(self.buildings.geometry.values)
+        self.source_path = source_path
+        self.source_mtime = source_mtime
+        self.layer = layer
+        self.source_size = source_size
+
+    def __len__(self):
+        return len(self.buildings)
+
+    @classmethod
+    def from_file(cls, vector_path, layer=None):
+        """
+        Loads a building layer with a single bulk read.
+        """
+        with stage('read_footprints') as timing:
+            buildings_gdf = gpd.read_file(vector_path, layer=layer, engine='pyogrio', use_arrow=_HAS_PYARROW)
+            timing.add(features=len(buildings_gdf), bytes_read=os.path.getsize(vector_path))
+        return cls(buildings_gdf, os.path.abspath(vector_path), os.path.getmtime(vector_path), layer,
+                   os.path.getsize(vector_path))
+
+    @property
+    def provenance(self):
+        return {'source_path': self.source_path, 'layer': self.layer, 'source_size': self.source_size,
+                'source_mtime': self.source_mtime}
+
+    @staticmethod
+    def read_provenance(index_path):
+        """
+        Provenance of a saved store, from its sidecar, or None if there is no readable sidecar.
+        """
+        try:
+            with open(sidecar_path(index_path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, index_path):
+        sidecar = cls.read_provenance(index_path)
+        if sidecar is None:
+            raise FileNotFoundError(f"No footprint store sidecar at {sidecar_path(index_path)}")
+        path = data_path(index_path, sidecar['format'])
+        with stage('read_footprints') as timing:
+            if sidecar['format'] == 'parquet':
+                buildings_gdf = gpd.read_parquet(path)
+            else:
+                buildings_gdf = gpd.read_file(path, engine='pyogrio', use_arrow=_HAS_PYARROW)
+            timing.add(features=len(buildings_gdf), bytes_read=os.path.getsize(path))
+        return cls(buildings_gdf, sidecar['source_path'], sidecar['source_mtime'], sidecar['layer'],
+                   sidecar['source_size'])
+
+    def save(self, index_path):
+        """
+        Saves the buildings next to index_path and their provenance to its sidecar.
+
+        Returns:
+        - index_path, to pass to load() or load_or_build().
+        """
+        fmt = 'parquet' if _HAS_PYARROW else 'fgb'
+        # The sidecar goes last and is removed first, so a failed save never looks valid
+        if os.path.exists(sidecar_path(index_path)):
+            os.remove(sidecar_path(index_path))
+        path = data_path(index_path, fmt)
+        if fmt == 'parquet':
+            self.buildings.to_parquet(path)
+        else:
+            if os.path.exists(path):
+                os.remove(path)
+            # Without the spatial index, which would reorder the features; the STRtree replaces it
+            self.buildings.to_file(path, driver='FlatGeobuf', engine='pyogrio', SPATIAL_INDEX='NO')
+        with open(sidecar_path(index_path), 'w') as f:
+            json.dump(dict(self.provenance, format=fmt), f, indent=2)
+        return index_path
+
+    @staticmethod
+    def source_provenance(vector_path, layer=None):
+        """
+        Provenance of this layer of vector_path, as it is on disk now.
+        """
+        return {'source_path': os.path.abspath(vector_path), 'layer': layer,
+                'source_size': os.path.getsize(vector_path), 'source_mtime': os.path.getmtime(vector_path)}
+
+    def is_built_from(self, vector_path, layer=None):
+        """
+        Whether the store was read from this layer of vector_path, as it is on disk now.
+        """
+        return self.provenance == self.source_provenance(vector_path, layer)
+
+    @classmethod
+    def load_or_build(cls, vector_path, index_path=None, layer=None):
+        """
+        Loads the store from index_path if its sidecar shows it was built from the current version
+        of the same layer of vector_path, otherwise reads vector_path and, if index_path is given,
+        saves the store there.
+        """
+        if index_path is not None:
+            sidecar = cls.read_provenance(index_path)
+            # A GeoParquet store saved where pyarrow was installed cannot be read without it
+            readable = sidecar is not None and (sidecar.get('format') != 'parquet' or _HAS_PYARROW)
+            current = cls.source_provenance(vector_path, layer)
+            if readable and all(sidecar.get(key) == value for key, value in current.items()):
+                return cls.load(index_path)
+        store = cls.from_file(vector_path, layer)
+        if index_path is not None:
+            store.save(index_path)
+        return store
+
+    def query(self, area):
+        """
+        Buildings intersecting a bbox (xmin, ymin, xmax, ymax) or a polygon.
+
+        Returns:
+        - GeoDataFrame of the matching buildings.
+        """
+        indices = self.tree.query(_as_geometry(area), predicate='intersects')
+        return self.buildings.iloc[np.sort(indices)]
+
+    def query_many(self, areas):
+        """
+        Buildings intersecting each of many bboxes or polygons, in one vectorized query.
+
+        Returns:
+        - List of GeoDataFrames, one per area.
+        """
+        geometries = [_as_geometry(area) for area in areas]
+        if not geometries:
+            return []
+        with stage('query_footprints', features=len(geometries)):
+            area_indices, building_indices = self.tree.query(geometries, predicate='intersects')
+            # Group the building indices by area, keeping the buildings of each area in layer order
+            order = np.lexsort((building_indices, area_indices))
+            area_indices, building_indices = area_indices[order], building_indices[order]
+            splits = np.searchsorted(area_indices, np.arange(1, len(geometries)))
+        return [self.buildings.iloc[indices] for indices in np.split(building_indices, splits)]
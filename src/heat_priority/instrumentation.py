@@ -0,0 +1,218 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+'''
+Lightweight stage timing and memory instrumentation for the pipeline.
+
+Stages are marked with the stage() context manager or the instrument() decorator. Each stage
+records wall time, CPU time, peak RSS and, where the caller reports them, pixels, points and
+bytes read, from which throughput is derived. Reports are written as JSON lines (one stage per
+line, appended as stages finish to a file emptied by enable()) or as a Chrome trace
+(chrome://tracing, Perfetto) on disable().
+
+Instrumentation is off by default and costs a single flag check per stage while off. Enable it
+from code with enable('run.jsonl') / enable('run.trace.json', fmt='chrome') or for a whole run
+by setting the HEAT_TRACE environment variable to the report path (a path ending in .json
+gives a Chrome trace, anything else JSON lines).
+'''
+
+_enabled = False
+_path = None
+_fmt = None
+_events = []
+_lock = threading.Lock()
+_origin = time.perf_counter()
+
+
+def _peak_rss_mb():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 2 ** 20
+    except (ImportError, AttributeError):
+        return None
+
+
+class Stage:
+    """
+    Measurements of one running stage. Counters are reported with add().
+    """
+    __slots__ = ('name', 'pixels', 'points', 'bytes_read', 'extra')
+
+    def __init__(self, name, pixels=0, points=0, bytes_read=0, **extra):
+        self.name = name
+        self.pixels = pixels
+        self.points = points
+        self.bytes_read = bytes_read
+        self.extra = extra
+
+    def add(self, pixels=0, points=0, bytes_read=0, **extra):
+        self.pixels += pixels
+        self.points += points
+        self.bytes_read += bytes_read
+        self.extra.update(extra)
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def add(self, pixels=0, points=0, bytes_read=0, **extra):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(path, fmt=None):
+    """
+    Turns instrumentation on.
+
+    Args:
+    - path: Path of the report. An existing report at path is overwritten.
+    - fmt: 'jsonl' or 'chrome'; by default 'chrome' for paths ending in .json, else 'jsonl'.
+    """
+    global _enabled, _path, _fmt
+    disable()
+    _path = path
+    _fmt = fmt or ('chrome' if path.endswith('.json') else 'jsonl')
+    if _fmt not in ('jsonl', 'chrome'):
+        raise ValueError("fmt must be 'jsonl' or 'chrome'")
+    if _fmt == 'jsonl':
+        # Stages are appended as they finish, so start from an empty file
+        open(path, 'w').close()
+    _events.clear()
+    _enabled = True
+
+
+def disable():
+    """
+    Turns instrumentation off and writes the Chrome trace, if that is the report format.
+    """
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    if _fmt == 'chrome':
+        with open(_path, 'w') as f:
+            json.dump({'traceEvents': _events, 'displayTimeUnit': 'ms'}, f)
+    _events.clear()
+
+
+def _record(stage, start_wall, wall_s, cpu_s, error):
+    record = {
+        'stage': stage.name,
+        'start_s': start_wall - _origin,
+        'wall_s': wall_s,
+        'cpu_s': cpu_s,
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+    if stage.pixels:
+        record['pixels'] = stage.pixels
+        record['pixels_per_s'] = stage.pixels / wall_s if wall_s else None
+    if stage.points:
+        record['points'] = stage.points
+        record['points_per_s'] = stage.points / wall_s if wall_s else None
+    if stage.bytes_read:
+        record['bytes_read'] = stage.bytes_read
+        record['read_mb_per_s'] = stage.bytes_read / 2 ** 20 / wall_s if wall_s else None
+    if error is not None:
+        record['error'] = error.__name__
+    record.update(stage.extra)
+
+    with _lock:
+        if _fmt == 'jsonl':
+            with open(_path, 'a') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+        else:
+            _events.append({
+                'name': stage.name,
+                'ph': 'X',
+                'ts': record['start_s'] * 1e6,
+                'dur': wall_s * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': {k: v for k, v in record.items() if k not in ('stage', 'start_s', 'wall_s')},
+            })
+
+
+@contextmanager
+def _measured_stage(name, counters):
+    stage = Stage(name, **counters)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    error = None
+    try:
+        yield stage
+    except BaseException as e:
+        error = type(e)
+        raise
+    finally:
+        _record(stage, start_wall, time.perf_counter() - start_wall, time.process_time() - start_cpu, error)
+
+
+def stage(name, **counters):
+    """
+    Context manager timing a pipeline stage.
+
+    Args:
+    - name: Name of the stage in the report.
+    - counters: Optional pixels, points and bytes_read processed by the stage, plus any
+      extra attributes to record. More can be reported on the yielded stage with add().
+
+    Example:
+        with stage('reproject_array', pixels=data.size) as s:
+            ...
+            s.add(bytes_read=data.nbytes)
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return _measured_stage(name, counters)
+
+
+def instrument(name=None):
+    """
+    Decorator timing every call of a function as a stage, named after the function by default.
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _measured_stage(stage_name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+atexit.register(disable)
+
+if os.environ.get('HEAT_TRACE'):
+    enable(os.environ['HEAT_TRACE'])
@@ -0,0 +1,55 @@
+import numpy as np
+
+'''
+Remapping of UrbanLandUse class codes, kept apart from solweig_inputs so it can be used and
+benchmarked without the city_metrix, geocube and exactextract dependencies.
+'''
+
+
+def remap(raster, from_values, to_values):
+    """
+    Remap values in a raster dataset.
+
+    Parameters:
+    - raster: xarray.DataArray, the raster data to remap.
+    - from_values: list of int, original values to be remapped.
+    - to_values: list of int, new values after remapping.
+
+    Returns:
+    - remapped raster as xarray.DataArray
+    """
+    # Ensure input lists are of the same length
+    if len(from_values) != len(to_values):
+        raise ValueError("from_values and to_values must have the same length")
+
+    # Class rasters of 8 or 16 bit integers are remapped through a lookup table in one pass,
+    # which keeps their dtype and allocates a single output array
+    if np.issubdtype(raster.dtype, np.integer) and raster.dtype.itemsize <= 2:
+        info = np.iinfo(raster.dtype)
+        if all(info.min <= to_val <= info.max for to_val in to_values):
+            # The table is indexed by the unsigned bit pattern, so signed rasters need no upcast
+            unsigned = np.dtype(f'u{raster.dtype.itemsize}')
+            lut = np.arange(2 ** (8 * raster.dtype.itemsize), dtype=unsigned).view(raster.dtype).astype(np.int64)
+            # Applied in sequence, like the pairwise remapping below
+            for from_val, to_val in zip(from_values, to_values):
+                lut[lut == from_val] = to_val
+            lut = lut.astype(raster.dtype)
+            return raster.copy(data=lut[raster.values.view(unsigned)])
+
+    # Imported here so the lookup table path only needs NumPy
+    import xarray as xr
+
+    # Copy the original raster to avoid modifying it directly
+    remapped_raster = raster.copy()
+
+    # Apply remapping
+    for from_val, to_val in zip(from_values, to_values):
+        remapped_raster = xr.where(remapped_raster == from_val, to_val, remapped_raster)
+
+    return remapped_raster
+
+
+# Assuming from_v2 and to_v2 are defined as in the excerpt
+from_v2 =    [1, 2, 3, 10, 20, 30, 40, 41, 42, 43, 44, 50]
+to_v2 =      [1, 2, 3,  4,  5,  6,  7,  7,  7,  7,  7,  8]
+to_solweig = [5, 1, 6,  5,  7,  1,  2,  2,  2,  2,  2,  1]
@@ -1,7 +1,5 @@
-from Align_ras import align_rasters
-from AOI_identify import identify_top_AOIs
-import matplotlib.pyplot as plt
-from rasterio.plot import show
+from .Align_ras import align_rasters
+from .AOI_identify import identify_top_AOIs
 import rasterio
 
 def plot_raster(src, title):
@@ -12,6 +10,9 @@ def plot_raster(src, title):
     - src: rasterio object to plot.
     - title: Title for the plot.
     """
+    import matplotlib.pyplot as plt
+    from rasterio.plot import show
+
     plt.figure(figsize=(8, 8))
     show(src)  # Display the raster data
     plt.title(title)
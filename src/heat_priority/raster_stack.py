@@ -0,0 +1,145 @@
+import json
+import os
+
+import numpy as np
+from affine import Affine
+
+'''
+On-disk raster stack for repeated AOI experiments.
+
+A stack is one uncompressed .npy file holding all aligned layers as a (bands, rows, cols) array,
+plus a JSON sidecar (<path>.json) with the band names, transform, CRS and nodata. Opening a stack
+memory-maps the file: there is no decoding and no copy, and a window over an AOI or validation
+box only reads the pages of the rows and columns it touches.
+'''
+
+
+def sidecar_path(path):
+    return f'{path}.json'
+
+
+def is_stack(path):
+    return os.path.exists(sidecar_path(path))
+
+
+def window_slices(transform, height, width, bounds):
+    """
+    Row and column slices of the pixels of a raster intersecting map bounds (xmin, ymin, xmax, ymax),
+    clipped to the raster.
+    """
+    xmin, ymin, xmax, ymax = bounds
+    inverse = ~transform
+    cols, rows = zip(*(inverse * (x, y) for x in (xmin, xmax) for y in (ymin, ymax)))
+    row_start = min(max(int(np.floor(min(rows))), 0), height)
+    row_stop = min(max(int(np.ceil(max(rows))), 0), height)
+    col_start = min(max(int(np.floor(min(cols))), 0), width)
+    col_stop = min(max(int(np.ceil(max(cols))), 0), width)
+    return slice(row_start, row_stop), slice(col_start, col_stop)
+
+
+def write_stack(path, metadata, dtype='float32', **layers):
+    """
+    Writes aligned layers to a stack.
+
+    Args:
+    - path: Path of the .npy file; the sidecar is written next to it.
+    - metadata: Metadata of the aligned rasters, with 'transform' and 'crs'.
+    - dtype: dtype of the stack.
+    - layers: 2D arrays of the same shape, keyed by band name.
+
+    Returns:
+    - Path of the stack.
+    """
+    names = list(layers)
+    shapes = {layers[name].shape for name in names}
+    if len(shapes) != 1:
+        raise ValueError(f"All layers must have the same shape, got {shapes}")
+    rows, cols = shapes.pop()
+
+    bands = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(len(names), rows, cols))
+    for i, name in enumerate(names):
+        bands[i] = layers[name]
+    bands.flush()
+    del bands
+
+    crs = metadata['crs']
+    sidecar = {
+        'bands': names,
+        'transform': list(metadata['transform'])[:6],
+        'crs': crs.to_wkt() if hasattr(crs, 'to_wkt') else str(crs),
+        'nodata': None if np.issubdtype(np.dtype(dtype), np.floating) else metadata.get('nodata'),
+    }
+    with open(sidecar_path(path), 'w') as f:
+        json.dump(sidecar, f, indent=2)
+    return path
+
+
+class RasterStack:
+    """
+    Memory-mapped, read-only view of a stack written by write_stack.
+    """
+    def __init__(self, path):
+        with open(sidecar_path(path)) as f:
+            sidecar = json.load(f)
+        self.path = path
+        self.band_names = sidecar['bands']
+        self.transform = Affine(*sidecar['transform'])
+        self.crs = sidecar['crs']
+        self.nodata = sidecar['nodata']
+        self.bands = np.load(path, mmap_mode='r')
+
+    @property
+    def height(self):
+        return self.bands.shape[1]
+
+    @property
+    def width(self):
+        return self.bands.shape[2]
+
+    @property
+    def metadata(self):
+        # Same keys as the metadata of Align_ras.align_rasters that the pipeline relies on
+        return {
+            'driver': 'GTiff',
+            'dtype': self.bands.dtype.name,
+            'nodata': self.nodata,
+            'width': self.width,
+            'height': self.height,
+            'count': 1,
+            'crs': self.crs,
+            'transform': self.transform,
+        }
+
+    def __getitem__(self, name):
+        """
+        Memory-mapped 2D view of a band, without reading it.
+        """
+        return self.bands[self.band_names.index(name)]
+
+    def window_bounds(self, bounds):
+        """
+        Row and column slices of the pixels intersecting map bounds (xmin, ymin, xmax, ymax),
+        clipped to the stack.
+        """
+        return window_slices(self.transform, self.height, self.width, bounds)
+
+    def read_window(self, name, bounds):
+        """
+        Reads the part of a band within map bounds.
+
+        Args:
+        - name: Band name.
+        - bounds: (xmin, ymin, xmax, ymax) in the CRS of the stack.
+
+        Returns:
+        - data: Memory-mapped 2D view of the window; only its pages are read when it is used.
+        - transform: Affine transformation of the window.
+        """
+        row_slice, col_slice = self.window_bounds(bounds)
+        data = self[name][row_slice, col_slice]
+        transform = self.transform * Affine.translation(col_slice.start, row_slice.start)
+        return data, transform
+
+
+def open_stack(path):
+    return RasterStack(path)
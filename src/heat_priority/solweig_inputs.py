@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""SOLWEIG-inputs.ipynb
+
+Automatically generated by Colab.
+
+Original file is located at
+    https://colab.research.google.com/drive/1e3rEbd7r08mNYyWI1edqQfFoev3p_8Tw
+"""
+
+# Commented out IPython magic to ensure Python compatibility.
+import os
+import numpy as np
+import xarray as xr
+
+import geopandas as gpd
+from city_metrix.layers import UrbanLandUse, TreeCanopyHeight, OvertureBuildings, AlosDSM, NasaDEM
+from geocube.api.core import make_geocube
+from rasterio.enums import Resampling
+from exactextract import exact_extract
+from .instrumentation import instrument
+from .land_use import remap, from_v2, to_v2, to_solweig
+
+import sys
+sys.dont_write_bytecode=True
+
+# %load_ext autoreload
+# %autoreload
+
+"""# Inputs"""
+
+# Inputs
+## Name of the area of interest
+aoi_name='ba_roi'
+
+## Data folder
+def file_path_prefix(file_prefix):
+    folder = f'./data/{file_prefix}'
+    os.makedirs(folder, exist_ok=True)
+    return f'{folder}/{file_prefix}'
+
+## Path to polygon file the area you want data for
+aoi_url = 'data/ba_roi.geojson'
+
+"""# Get Polygon for AOI"""
+
+@instrument()
+def load_aoi(aoi_url, aoi_name):
+    # If you are using an SSO accout, you need to be authenticated first
+    # !aws sso login
+    aoi_gdf = gpd.read_file(aoi_url, driver='GeoJSON')
+
+    aoi_gdf = aoi_gdf.to_crs(epsg=4326)
+
+    ## Write to file
+    file_path = f'{file_path_prefix(aoi_name)}-boundary.geojson'
+    aoi_gdf.to_file(file_path, driver='GeoJSON')
+    print(f'File saved to {file_path}')
+
+    ## Get area in km2 of the city rounded to the nearest integer
+    aoi_gdf_area = aoi_gdf['geometry'].to_crs(epsg=3857).area/ 10**6 # in km2
+    aoi_gdf_area = round(aoi_gdf_area.values[0])
+    print(f'Area: {aoi_gdf_area} sqkm')
+
+    return aoi_gdf
+
+"""# LULC"""
+
+def count_occurrences(data, value):
+    return data.where(data==value).count().item()
+
+
+@instrument()
+def get_urban_land_use(aoi_gdf, aoi_name):
+    # Load layer
+    aoi_UrbanLandUse = UrbanLandUse().get_data(aoi_gdf.total_bounds)
+
+    # Get resolution of the data
+    print(f'Resolution: {aoi_UrbanLandUse.rio.resolution()}')
+
+    # Convert values to integers, class codes fit in 8 bits
+    aoi_UrbanLandUse = aoi_UrbanLandUse.astype(np.uint8)
+
+    # Remove zeros
+    remove_value = 0
+    count = count_occurrences(aoi_UrbanLandUse, remove_value)
+
+    if count > 0:
+        print(f'Found {count} occurrences of the value {remove_value}. Removing...')
+        aoi_UrbanLandUse = aoi_UrbanLandUse.where(aoi_UrbanLandUse!=remove_value, drop=True)
+        count = count_occurrences(aoi_UrbanLandUse, remove_value)
+        print(f'There are {count} occurrences of the value {remove_value} after removing.')
+        # where() masks with NaN, which upcasts to float64; the masked cells go back to 0 as nodata
+        aoi_UrbanLandUse = aoi_UrbanLandUse.fillna(remove_value).astype(np.uint8).rio.write_nodata(remove_value)
+    else:
+        print(f'There were no occurrences of the value {remove_value} found in data.')
+
+    # Apply the remap function
+    aoi_UrbanLandUse_to_solweig = remap(aoi_UrbanLandUse, from_v2, to_solweig)
+
+    # Create a table of the land use types and their counts from aoi_UrbanLandUse DataArray
+    land_use_counts_to_solweig = aoi_UrbanLandUse_to_solweig.groupby(aoi_UrbanLandUse_to_solweig).count().to_dataframe()
+    print(land_use_counts_to_solweig)
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-UrbanLandUseV2.tif'
+    aoi_UrbanLandUse_to_solweig.rio.to_raster(raster_path=file_path, driver="COG")
+    print(f'File saved to {file_path}')
+
+    return aoi_UrbanLandUse_to_solweig
+
+"""# High Resolution 1m Global Canopy Height Maps
+
+https://gee-community-catalog.org/projects/meta_trees/
+
+"""
+
+@instrument()
+def get_tree_canopy_height(aoi_gdf, aoi_name):
+    # Load layer
+    aoi_TreeCanopyHeight = TreeCanopyHeight().get_data(aoi_gdf.total_bounds)
+
+    print(f'Resolution: {aoi_TreeCanopyHeight.rio.resolution()}')
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-TreeCanopyHeight.tif'
+    aoi_TreeCanopyHeight.rio.to_raster(raster_path=file_path, driver="COG")
+    print(f'File saved to {file_path}')
+
+    return aoi_TreeCanopyHeight
+
+"""# Building footprints"""
+
+@instrument()
+def get_buildings(aoi_gdf, aoi_name):
+    # Load layer
+    aoi_OvertureBuildings = OvertureBuildings().get_data(aoi_gdf.total_bounds)
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-OvertureBuildings.geojson'
+    aoi_OvertureBuildings.to_file(file_path, driver='GeoJSON')
+    print(f'File saved to {file_path}')
+
+    return aoi_OvertureBuildings
+
+"""# DSM"""
+
+@instrument()
+def get_dsm(aoi_gdf, aoi_name):
+    aoi_AlosDSM = AlosDSM().get_data(aoi_gdf.total_bounds)
+
+    print(f'Resolution: {aoi_AlosDSM.rio.resolution()}')
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-aoi_AlosDSM.tif'
+    aoi_AlosDSM.rio.to_raster(raster_path=file_path, driver="COG")
+    print(f'File saved to {file_path}')
+
+    dsm_1m = aoi_AlosDSM.rio.reproject(
+                dst_crs=aoi_AlosDSM.rio.crs,
+                resolution=1,
+                resampling=Resampling.bilinear
+            )
+
+    print(f'Resolution: {dsm_1m.rio.resolution()}')
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-aoi_AlosDSM_1m.tif'
+    dsm_1m.rio.to_raster(raster_path=file_path, driver="COG")
+    print(f'File saved to {file_path}')
+
+    return aoi_AlosDSM
+
+"""# DEM"""
+
+@instrument()
+def get_dem(aoi_gdf, aoi_name):
+    aoi_NasaDEM = NasaDEM().get_data(aoi_gdf.total_bounds)
+
+    print(f'Resolution: {aoi_NasaDEM.rio.resolution()}')
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-aoi_NasaDEM.tif'
+    aoi_NasaDEM.rio.to_raster(raster_path=file_path, driver="COG")
+    print(f'File saved to {file_path}')
+
+    dem_1m = aoi_NasaDEM.rio.reproject(
+                dst_crs=aoi_NasaDEM.rio.crs,
+                resolution=1,
+                resampling=Resampling.bilinear
+            )
+
+    # Save data to file
+    file_path = f'{file_path_prefix(aoi_name)}-aoi_NasaDEM_1m.tif'
+    dem_1m.rio.to_raster(raster_path=file_path, driver="COG")
+    print(f'File saved to {file_path}')
+
+    return aoi_NasaDEM
+
+"""# Building height"""
+
+@instrument()
+def get_building_heights(aoi_OvertureBuildings, aoi_AlosDSM, aoi_NasaDEM, aoi_name):
+    aoi_height = aoi_AlosDSM - aoi_NasaDEM
+
+    aoi_OvertureBuildings = aoi_OvertureBuildings.to_crs(aoi_AlosDSM.rio.crs)
+
+    aoi_OvertureBuildings['AlosDSM_max'] = exact_extract(aoi_AlosDSM, aoi_OvertureBuildings, ["max"], output='pandas')['max']
+    aoi_OvertureBuildings['NasaDEM_max'] = exact_extract(aoi_NasaDEM, aoi_OvertureBuildings, ["max"], output='pandas')['max']
+    aoi_OvertureBuildings['height_max'] = exact_extract(aoi_height, aoi_OvertureBuildings, ["max"], output='pandas')['max']
+
+    # Write to file
+    file_path = f'{file_path_prefix(aoi_name)}-BuildingHights.geojson'
+    aoi_OvertureBuildings.to_file(file_path, driver='GeoJSON')
+    print(f'File saved to {file_path}')
+
+    return aoi_OvertureBuildings
+
+def rasterize_polygon(gdf, snap_to):
+        if gdf.empty:
+            raster = np.full(snap_to.shape, 0, dtype=np.int8)
+            raster = xr.DataArray(raster, dims=snap_to.dims, coords=snap_to.coords)
+
+            return raster.rio.write_crs(snap_to.rio.crs, inplace=True)
+
+        raster = make_geocube(
+            vector_data=gdf,
+            measurements=["Value"],
+            like=snap_to,
+            fill=np.int8(0)
+        ).Value
+
+        return raster.rio.reproject_match(snap_to)
+
+"""# ERA5"""
+
+
+def main(aoi_url=aoi_url, aoi_name=aoi_name):
+    aoi_gdf = load_aoi(aoi_url, aoi_name)
+    get_urban_land_use(aoi_gdf, aoi_name)
+    get_tree_canopy_height(aoi_gdf, aoi_name)
+    aoi_OvertureBuildings = get_buildings(aoi_gdf, aoi_name)
+    aoi_AlosDSM = get_dsm(aoi_gdf, aoi_name)
+    aoi_NasaDEM = get_dem(aoi_gdf, aoi_name)
+    get_building_heights(aoi_OvertureBuildings, aoi_AlosDSM, aoi_NasaDEM, aoi_name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import laspy
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+from .instrumentation import instrument, stage
+
+
+def cropping(las, bbx, out_las_file_path):
+    # Define the bounding box
+    min_x, min_y, max_x, max_y = bbx
+
+    mask = ((las.x >= min_x) & (las.x <= max_x) & (las.y >= min_y) & (las.y <= max_y))
+
+    # Filter points based on the bounding box
+    cropped = laspy.create(point_format=las.header.point_format, file_version=las.header.version)
+    cropped.header = las.header  # Copy header information
+    cropped.points = las.points[mask]
+    print('Points from cropped data:', len(cropped.points))
+
+    # Write the cropped LAS file
+    cropped.write(out_las_file_path)
+
+    return 0
+
+
+def generate_points_around(center_x, center_y, center_z, radius, num_points=10):
+    angles = np.linspace(0, 2 * np.pi, num_points, endpoint=False)
+    return [(center_x + radius * np.cos(angle), center_y + radius * np.sin(angle), center_z) for angle in angles]
+
+
+# densifying the point cloud
+@instrument()
+def densify_points(xs, ys, zs, radius=0.20, num_points=10):
+    densified_points = []
+    for x, y, z in zip(xs, ys, zs):
+        points_around = generate_points_around(x, y, z, radius, num_points)
+        densified_points.extend(points_around)
+    return densified_points
+
+
+def grid_max_height(points, min_x, min_y, max_x, max_y, cell_size=1):
+    """
+    Grids (x, y, z) points into a raster holding the highest z per cell.
+
+    Args:
+    - points: Sequence of (x, y, z) tuples.
+    - min_x, min_y, max_x, max_y: Bounding box of the grid.
+    - cell_size: Cell size in the units of the point coordinates.
+
+    Returns:
+    - heights: 2D float32 array of max heights, NaN where no point fell.
+    - transform: Affine transform of the grid.
+    """
+    # Grid dimensions
+    x_coords = np.arange(min_x, max_x, cell_size)
+    y_coords = np.arange(min_y, max_y, cell_size)
+    grid_width = len(x_coords)
+    grid_height = len(y_coords)
+
+    # float32 keeps millimetre precision for heights below ~100 m (0.1 mm up to ~1000 m)
+    heights = np.full((grid_height, grid_width), fill_value=np.nan, dtype=np.float32)
+    with stage('grid_max_height', pixels=heights.size, points=len(points)):
+        for x, y, z in points:
+            x_idx = int((x - min_x) / cell_size)
+            y_idx = int((max_y - y) / cell_size)
+            if 0 <= x_idx < grid_width and 0 <= y_idx < grid_height:
+                if np.isnan(heights[y_idx][x_idx]) or heights[y_idx, x_idx] < z:
+                    heights[y_idx][x_idx] = z
+
+    # Geospatial transform
+    transform = from_origin(min_x, max_y, cell_size, cell_size)
+
+    return heights, transform
+
+
+def write_height_raster(heights, transform, output_file_path, crs='EPSG:7415'):
+    with rasterio.open(
+        output_file_path,  # Use the user-provided file path
+        'w',
+        driver='GTiff',
+        height=heights.shape[0],
+        width=heights.shape[1],
+        count=1,
+        dtype=heights.dtype,
+        crs=crs,  # Setting the CRS to RDNAP
+        transform=transform
+    ) as dst:
+        dst.write(heights, 1)
+
+
+if __name__ == "__main__":
+    min_x, min_y, max_x, max_y = 181437.246002, 318805.419006, 181937.246002, 319305.419006
+    cell_size = 1
+
+    las = laspy.read(input("Enter the input LAS file path: "))
+    # Keep the vegetation classes (low, medium, high)
+    filtered_points = las.points[np.isin(las.classification, [3, 4, 5])]
+
+    densified_points = densify_points(filtered_points.x, filtered_points.y, filtered_points.z, radius=0.20)
+    heights, transform = grid_max_height(densified_points, min_x, min_y, max_x, max_y, cell_size)
+
+    # Write to a TIFF file
+    output_file_path = input("Enter the output file path for the vegetation raster: ")
+    write_height_raster(heights, transform, output_file_path)
+
+    print(f"vegetation raster saved to: {output_file_path}")
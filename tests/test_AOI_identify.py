@@ -0,0 +1,77 @@
+import geopandas as gpd
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+from shapely.geometry import Point, box
+
+from heat_priority.AOI_identify import compute_heat_score, identify_top_AOIs, sliding_window_aggregate
+
+
+def synthetic_layers(size=64, seed=0):
+    rng = np.random.default_rng(seed)
+    lst = rng.uniform(290, 320, (size, size)).astype(np.float32)
+    ndvi = rng.uniform(-0.2, 0.9, (size, size)).astype(np.float32)
+    height = rng.uniform(0, 30, (size, size)).astype(np.float32)
+    lst[rng.random((size, size)) < 0.05] = np.nan
+    metadata = {
+        'crs': 'EPSG:28992',
+        'transform': from_origin(120000, 490000, 10, 10),
+        'width': size,
+        'height': size,
+    }
+    return lst, ndvi, height, metadata
+
+
+def test_top_AOIs_lie_on_the_raster_and_cover_the_aggregate_peaks(tmp_path):
+    lst, ndvi, height, metadata = synthetic_layers()
+    # 100 m AOIs on the 10 m grid, i.e. a 10 pixel window
+    top_AOIs = identify_top_AOIs(lst, ndvi, height, metadata, top_n=3, target_km=0.1, output_folder=str(tmp_path))
+
+    aois = gpd.read_file(tmp_path / 'top_aois.gpkg').sort_values('rank')
+    assert list(aois['rank']) == [1, 2, 3]
+    assert np.allclose(aois['score'], [aoi['score'] for aoi in top_AOIs])
+
+    raster_box = box(120000, 490000 - 640, 120640, 490000)
+    for geometry in aois.geometry:
+        assert raster_box.contains(geometry)
+        assert np.isclose(geometry.area, 100 * 100)
+
+    # The AOIs do not overlap
+    geometries = list(aois.geometry)
+    for i in range(len(geometries)):
+        for j in range(i + 1, len(geometries)):
+            assert geometries[i].intersection(geometries[j]).area == 0
+
+    # The peak of the aggregated COG lies in the first AOI, with the same score
+    with rasterio.open(tmp_path / 'heat_aggregated.tif') as src:
+        aggregated = src.read(1)
+        row, col = np.unravel_index(np.nanargmax(aggregated), aggregated.shape)
+        peak = Point(src.transform * (col + 0.5, row + 0.5))
+    assert geometries[0].contains(peak)
+    assert np.isclose(aois['score'].iloc[0], np.nanmax(aggregated))
+
+
+def test_AOI_scores_match_the_mean_heat_score_of_their_box():
+    lst, ndvi, height, metadata = synthetic_layers(seed=1)
+    heat_score, _ = compute_heat_score(lst, ndvi, height)
+    inverse = ~metadata['transform']
+
+    for aoi in identify_top_AOIs(lst, ndvi, height, metadata, top_n=3, target_km=0.1):
+        col, row = (int(round(v)) for v in inverse * aoi['top_left'])
+        assert np.isclose(aoi['score'], np.nanmean(heat_score[row:row + 10, col:col + 10]), rtol=1e-5)
+
+
+def test_top_n_stops_when_no_window_is_left():
+    lst, ndvi, height, metadata = synthetic_layers(size=20)
+    # Two 10 pixel windows fit at most on a 20 pixel grid
+    top_AOIs = identify_top_AOIs(lst, ndvi, height, metadata, top_n=10, target_km=0.1)
+    assert 1 <= len(top_AOIs) <= 4
+
+
+def test_sliding_window_aggregate_is_the_window_mean():
+    array = np.arange(25, dtype=np.float32).reshape(5, 5)
+    array[0, 0] = np.nan
+    aggregated = sliding_window_aggregate(array, 2)
+    assert aggregated.shape == (4, 4)
+    assert np.isclose(aggregated[0, 0], np.mean([1, 5, 6]))
+    assert np.isclose(aggregated[3, 3], np.mean([18, 19, 23, 24]))
@@ -0,0 +1,66 @@
+import numpy as np
+import rasterio
+from rasterio.transform import array_bounds, from_origin
+from rasterio.warp import Resampling, reproject
+
+from heat_priority.Align_ras import align_rasters, target_transform
+
+
+def write_constant(path, value, crs, origin, pixel_size, size):
+    meta = {
+        'driver': 'GTiff',
+        'dtype': 'float32',
+        'nodata': None,
+        'width': size,
+        'height': size,
+        'count': 1,
+        'crs': crs,
+        'transform': from_origin(*origin, pixel_size, pixel_size),
+    }
+    with rasterio.open(path, 'w', **meta) as dst:
+        dst.write(np.full((size, size), value, dtype=np.float32), 1)
+    return str(path)
+
+
+def test_reprojected_rasters_are_cropped_to_their_projected_extent(tmp_path):
+    # ~1 km of 10 m pixels in EPSG:4326 and a larger RD New raster around it
+    lst = write_constant(tmp_path / 'lst.tif', 300.0, 'EPSG:4326', (4.85, 52.40), 0.00015, 96)
+    ndvi = write_constant(tmp_path / 'ndvi.tif', 0.5, 'EPSG:28992', (119000.0, 491000.0), 10.0, 400)
+    tree = write_constant(tmp_path / 'tree.tif', 12.0, 'EPSG:28992', (119000.0, 491000.0), 10.0, 400)
+
+    lst_aligned, ndvi_aligned, tree_aligned, meta = align_rasters(lst, ndvi, tree, target_crs='EPSG:28992')
+
+    # The grid lies within the projected extent of the EPSG:4326 raster
+    transform, width, height = target_transform(from_origin(4.85, 52.40, 0.00015, 0.00015), 'EPSG:4326',
+                                                'EPSG:28992', 96, 96)
+    west, south, east, north = array_bounds(height, width, transform)
+    grid_west, grid_south, grid_east, grid_north = array_bounds(meta['height'], meta['width'], meta['transform'])
+    assert west <= grid_west and grid_east <= east + 1e-6
+    assert south <= grid_south + 1e-6 and grid_north <= north
+
+    # Cells without data are NaN, never 0
+    for aligned, value in ((lst_aligned, 300.0), (ndvi_aligned, 0.5), (tree_aligned, 12.0)):
+        assert aligned.dtype == np.float32
+        assert not np.any(aligned == 0)
+        assert np.allclose(aligned[~np.isnan(aligned)], value)
+    assert np.isnan(meta['nodata'])
+
+
+def test_reprojected_raster_is_warped_once_onto_the_grid(tmp_path):
+    size = 96
+    ramp = np.add.outer(np.arange(size), np.arange(size) ** 1.5).astype(np.float32)
+    meta = {'driver': 'GTiff', 'dtype': 'float32', 'nodata': None, 'width': size, 'height': size, 'count': 1,
+            'crs': 'EPSG:4326', 'transform': from_origin(4.85, 52.40, 0.00015, 0.00015)}
+    lst = str(tmp_path / 'lst.tif')
+    with rasterio.open(lst, 'w', **meta) as dst:
+        dst.write(ramp, 1)
+    ndvi = write_constant(tmp_path / 'ndvi.tif', 0.5, 'EPSG:28992', (119000.0, 491000.0), 10.0, 400)
+    tree = write_constant(tmp_path / 'tree.tif', 12.0, 'EPSG:28992', (119000.0, 491000.0), 10.0, 400)
+
+    lst_aligned, _, _, aligned_meta = align_rasters(lst, ndvi, tree, target_crs='EPSG:28992')
+
+    expected = np.full(lst_aligned.shape, np.nan, dtype=np.float32)
+    reproject(source=ramp, destination=expected, src_transform=meta['transform'], src_crs='EPSG:4326',
+              dst_transform=aligned_meta['transform'], dst_crs='EPSG:28992', src_nodata=np.nan, dst_nodata=np.nan,
+              resampling=Resampling.bilinear)
+    assert np.array_equal(lst_aligned, expected, equal_nan=True)
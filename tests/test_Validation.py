@@ -0,0 +1,119 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+from shapely.geometry import box
+
+from heat_priority import instrumentation
+from heat_priority.Validation import generate_cell_centers_and_heights, process_buildings, process_many_AOIs
+from heat_priority.raster_stack import write_stack
+
+ORIGIN_X, ORIGIN_Y = 120000.0, 490000.0
+
+
+def write_dsm(tmp_path, size=40, seed=0):
+    height = np.random.default_rng(seed).uniform(0, 60, (size, size)).astype(np.float32)
+    metadata = {
+        'driver': 'GTiff',
+        'dtype': 'float32',
+        'nodata': np.nan,
+        'width': size,
+        'height': size,
+        'count': 1,
+        'crs': 'EPSG:28992',
+        'transform': from_origin(ORIGIN_X, ORIGIN_Y, 10, 10),
+    }
+    tif_path = str(tmp_path / 'dsm.tif')
+    with rasterio.open(tif_path, 'w', **metadata) as dst:
+        dst.write(height, 1)
+    stack_path = write_stack(str(tmp_path / 'stack.npy'), metadata, dsm=height)
+    return tif_path, stack_path
+
+
+def write_buildings(tmp_path):
+    # The middle row of buildings crosses the bottom edge of the bbox
+    geometries = [box(ORIGIN_X + x, ORIGIN_Y - y - 45, ORIGIN_X + x + 45, ORIGIN_Y - y)
+                  for x in (20, 120, 220) for y in (20, 180, 300)]
+    buildings = gpd.GeoDataFrame({'id': np.arange(len(geometries)), 'height': np.linspace(5, 45, len(geometries))},
+                                 geometry=geometries, crs='EPSG:28992')
+    path = str(tmp_path / 'buildings.gpkg')
+    buildings.to_file(path, layer='buildings', driver='GPKG')
+    return path
+
+
+def as_tuples(building_stats):
+    return {building_id: (stats.max_val, stats.min_val, stats.avg_val, stats.stddev_val, stats.num_points)
+            for building_id, stats in building_stats.items()}
+
+
+def test_stack_and_geotiff_give_the_same_stats(tmp_path):
+    tif_path, stack_path = write_dsm(tmp_path)
+    vector_path = write_buildings(tmp_path)
+    bbox = box(ORIGIN_X, ORIGIN_Y - 200, ORIGIN_X + 400, ORIGIN_Y)
+
+    tif_stats, tif_avg, tif_std = process_buildings(tif_path, vector_path, bbox)
+    stack_stats, stack_avg, stack_std = process_buildings(stack_path, vector_path, bbox, band='dsm')
+
+    assert len(tif_stats) == 6
+    stack_tuples, tif_tuples = as_tuples(stack_stats), as_tuples(tif_stats)
+    assert stack_tuples.keys() == tif_tuples.keys()
+    for building_id, values in tif_tuples.items():
+        # Cells may come out of the index in another order, so float32 sums can differ slightly
+        assert np.allclose(stack_tuples[building_id], values, rtol=1e-6)
+    assert np.isclose(stack_avg, tif_avg) and np.isclose(stack_std, tif_std)
+
+
+def test_many_AOIs_match_one_AOI_at_a_time(tmp_path):
+    tif_path, _ = write_dsm(tmp_path)
+    vector_path = write_buildings(tmp_path)
+    bboxes = [box(ORIGIN_X, ORIGIN_Y - 200, ORIGIN_X + 400, ORIGIN_Y),
+              box(ORIGIN_X + 100, ORIGIN_Y - 400, ORIGIN_X + 300, ORIGIN_Y - 150),
+              box(ORIGIN_X + 1000, ORIGIN_Y - 100, ORIGIN_X + 1100, ORIGIN_Y)]
+
+    results = process_many_AOIs(tif_path, vector_path, bboxes, index_path=str(tmp_path / 'buildings.index'))
+
+    assert len(results) == 3
+    for (building_stats, avg_diff, stddev_diff), bbox in zip(results, bboxes):
+        expected_stats, expected_avg, expected_std = process_buildings(tif_path, vector_path, bbox)
+        assert as_tuples(building_stats) == as_tuples(expected_stats)
+        assert np.isclose(avg_diff, expected_avg) and np.isclose(stddev_diff, expected_std)
+    assert results[2] == ({}, 0, 0)
+
+
+def test_only_the_cells_within_the_bounds_are_generated(tmp_path):
+    tif_path, _ = write_dsm(tmp_path)
+    everything = generate_cell_centers_and_heights(tif_path)
+    window = generate_cell_centers_and_heights(tif_path, (ORIGIN_X + 15, ORIGIN_Y - 45, ORIGIN_X + 45, ORIGIN_Y - 5))
+
+    assert len(everything) == 40 * 40
+    assert len(window) == 4 * 5
+    heights = {(point.x, point.y): height for point, height in everything}
+    assert all(heights[(point.x, point.y)] == height for point, height in window)
+    assert generate_cell_centers_and_heights(tif_path, (0, 0, 10, 10)) == []
+
+
+def test_trace_separates_the_raster_read_and_has_one_points_in_polygon_record(tmp_path):
+    tif_path, _ = write_dsm(tmp_path)
+    vector_path = write_buildings(tmp_path)
+    trace = tmp_path / 'run.jsonl'
+    instrumentation.enable(str(trace))
+    try:
+        process_buildings(tif_path, vector_path, box(ORIGIN_X, ORIGIN_Y - 200, ORIGIN_X + 400, ORIGIN_Y))
+    finally:
+        instrumentation.disable()
+
+    records = [json.loads(line) for line in trace.read_text().splitlines()]
+    points_records = [record for record in records if record['stage'] == 'points_in_polygon']
+    assert len(points_records) == 1
+    assert points_records[0]['features'] == 6
+    assert points_records[0]['points'] > 0
+
+    # The window read is timed on its own, apart from building the cell centres
+    read_records = [record for record in records if record['stage'] == 'read_raster']
+    assert len(read_records) == 1
+    assert read_records[0]['bytes_read'] == read_records[0]['pixels'] * 4 > 0
+    cell_records = [record for record in records if record['stage'] == 'generate_cell_centers_and_heights']
+    assert cell_records[0]['pixels'] == read_records[0]['pixels']
+    assert 'bytes_read' not in cell_records[0]
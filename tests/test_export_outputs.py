@@ -0,0 +1,47 @@
+import warnings
+
+import numpy as np
+import rasterio
+from rasterio.transform import from_origin
+
+from heat_priority.export_outputs import HEAT_INT16_SCALE, INT16_NODATA, quantize_int16, write_cog
+
+
+def heat_surface(size=256, seed=0):
+    rng = np.random.default_rng(seed)
+    array = rng.uniform(0, 3, (size, size)).astype(np.float32)
+    array[rng.random((size, size)) < 0.05] = np.nan
+    return array
+
+
+def test_quantize_int16_round_trip_is_within_half_a_step():
+    array = heat_surface()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        quantized = quantize_int16(array, HEAT_INT16_SCALE)
+
+    nan_mask = np.isnan(array)
+    assert quantized.dtype == np.int16
+    assert np.array_equal(quantized == INT16_NODATA, nan_mask)
+
+    restored = quantized[~nan_mask] * HEAT_INT16_SCALE
+    assert np.max(np.abs(restored - array[~nan_mask])) <= HEAT_INT16_SCALE / 2
+
+
+def test_quantize_int16_keeps_out_of_range_values_off_nodata():
+    quantized = quantize_int16(np.array([-10.0, 10.0, np.nan], dtype=np.float32), HEAT_INT16_SCALE)
+    assert list(quantized) == [-32767, 32767, INT16_NODATA]
+
+
+def test_int16_cog_is_restored_through_its_scale_and_offset(tmp_path):
+    array = heat_surface(size=64, seed=1)
+    metadata = {'crs': 'EPSG:28992', 'transform': from_origin(120000, 490000, 10, 10)}
+    path = write_cog(array, metadata, str(tmp_path / 'heat_score.tif'), scale=HEAT_INT16_SCALE, offset=1.0)
+
+    with rasterio.open(path) as src:
+        assert src.dtypes[0] == 'int16'
+        stored = src.read(1, masked=True)
+        restored = stored.astype(np.float64) * src.scales[0] + src.offsets[0]
+
+    assert np.array_equal(stored.mask, np.isnan(array))
+    assert np.max(np.abs(restored.compressed() - array[~np.isnan(array)])) <= HEAT_INT16_SCALE / 2
@@ -0,0 +1,89 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import box
+
+from heat_priority.footprint_store import FootprintStore, data_path, sidecar_path
+
+
+def buildings(n=5):
+    # 10 x 10 squares along the x axis, every 20 units
+    return gpd.GeoDataFrame({'id': np.arange(n), 'height': np.arange(n) * 3.0},
+                            geometry=[box(20 * i, 0, 20 * i + 10, 10) for i in range(n)], crs='EPSG:28992')
+
+
+@pytest.fixture
+def vector_path(tmp_path):
+    path = str(tmp_path / 'buildings.gpkg')
+    buildings().to_file(path, layer='buildings', driver='GPKG')
+    return path
+
+
+def test_query_many_groups_buildings_per_area_including_empty_areas():
+    store = FootprintStore(buildings())
+    areas = [(100, 100, 200, 200), box(15, 0, 45, 5), (0, 0, 5, 5), (500, 0, 600, 10), (-1, -1, 200, 20)]
+    results = store.query_many(areas)
+
+    assert [list(result['id']) for result in results] == [[], [1, 2], [0], [], [0, 1, 2, 3, 4]]
+    for area, result in zip(areas, results):
+        assert list(result['id']) == list(store.query(area)['id'])
+
+
+def test_query_many_of_no_areas_is_empty():
+    assert FootprintStore(buildings()).query_many([]) == []
+
+
+def test_saved_store_keeps_its_buildings_and_answers_queries(tmp_path):
+    store = FootprintStore(buildings(), source_path='buildings.gpkg', source_mtime=1.0, layer='buildings',
+                           source_size=10)
+    index_path = store.save(str(tmp_path / 'buildings.index'))
+    assert os.path.exists(sidecar_path(index_path))
+    assert os.path.exists(data_path(index_path, FootprintStore.read_provenance(index_path)['format']))
+    reloaded = FootprintStore.load(index_path)
+
+    assert len(reloaded) == len(store)
+    assert list(reloaded.buildings['id']) == list(range(5))
+    assert reloaded.provenance == store.provenance
+    # The STRtree is rebuilt on load
+    assert list(reloaded.query((15, 0, 45, 5))['id']) == [1, 2]
+    assert [list(result['id']) for result in reloaded.query_many([(0, 0, 5, 5), (200, 0, 300, 10)])] == [[0], []]
+
+
+def test_load_or_build_does_not_read_a_store_without_a_sidecar(vector_path, tmp_path):
+    # E.g. stale or foreign files; they are never opened, just replaced
+    index_path = tmp_path / 'buildings.index'
+    for fmt in ('parquet', 'fgb'):
+        (tmp_path / f'buildings.index.{fmt}').write_bytes(b'not a footprint store')
+    store = FootprintStore.load_or_build(vector_path, str(index_path))
+
+    assert len(store) == 5
+    assert FootprintStore.read_provenance(str(index_path))['source_path'] == os.path.abspath(vector_path)
+    assert len(FootprintStore.load(str(index_path))) == 5
+
+
+def test_load_or_build_reuses_the_store_of_the_same_source(vector_path, tmp_path):
+    index_path = str(tmp_path / 'buildings.index')
+    built = FootprintStore.load_or_build(vector_path, index_path)
+    assert os.path.exists(sidecar_path(index_path))
+
+    # Mark the saved store, so a reload can be told apart from a rebuild
+    built.buildings['height'] = -1.0
+    built.save(index_path)
+    assert (FootprintStore.load_or_build(vector_path, index_path).buildings['height'] == -1.0).all()
+
+
+def test_load_or_build_rebuilds_for_another_layer_or_file(vector_path, tmp_path):
+    index_path = str(tmp_path / 'buildings.index')
+    store = FootprintStore.load_or_build(vector_path, index_path)
+    store.buildings['height'] = -1.0
+    store.save(index_path)
+
+    assert (FootprintStore.load_or_build(vector_path, index_path, layer='buildings').buildings['height'] >= 0).all()
+
+    # A file with the same mtime at another path is not the same source
+    other_path = str(tmp_path / 'other.gpkg')
+    buildings(3).to_file(other_path, layer='buildings', driver='GPKG')
+    os.utime(other_path, (os.path.getatime(vector_path), os.path.getmtime(vector_path)))
+    assert len(FootprintStore.load_or_build(other_path, index_path, layer='buildings')) == 3
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from heat_priority import instrumentation
+from heat_priority.instrumentation import instrument, stage
+
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / 'run.jsonl'
+    path.write_text('{"stage": "stale"}\n')
+    instrumentation.enable(str(path))
+    yield path
+    instrumentation.disable()
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_enable_starts_a_new_jsonl_report(trace):
+    with stage('first', pixels=10):
+        pass
+    instrumentation.enable(str(trace))
+    with stage('second', pixels=20):
+        pass
+
+    records = read_records(trace)
+    assert [record['stage'] for record in records] == ['second']
+    assert records[0]['pixels'] == 20
+
+
+def test_instrument_records_errors(trace):
+    @instrument('failing')
+    def failing():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        failing()
+    records = read_records(trace)
+    assert len(records) == 1
+    assert records[0]['stage'] == 'failing' and records[0]['error'] == 'ValueError'
+
@@ -0,0 +1,40 @@
+import numpy as np
+import xarray as xr
+
+from heat_priority.land_use import from_v2, remap, to_solweig
+
+
+def class_raster(values, dtype):
+    return xr.DataArray(np.array(values, dtype=dtype), dims=('y', 'x'))
+
+
+def test_remap_is_applied_in_sequence():
+    # 1 -> 2 is applied before 2 -> 3, so both end up as 3
+    raster = class_raster([[1, 2], [3, 4]], np.uint8)
+    remapped = remap(raster, [1, 2], [2, 3])
+    assert remapped.dtype == np.uint8
+    assert remapped.values.tolist() == [[3, 3], [3, 4]]
+
+
+def test_lookup_table_matches_the_pairwise_remap():
+    rng = np.random.default_rng(0)
+    codes = rng.choice(from_v2 + [0, 255], size=(32, 32))
+    lut = remap(class_raster(codes, np.uint8), from_v2, to_solweig)
+    # int32 rasters take the xr.where path
+    pairwise = remap(class_raster(codes, np.int32), from_v2, to_solweig)
+    assert lut.dtype == np.uint8
+    assert np.array_equal(lut.values, pairwise.values)
+
+
+def test_signed_rasters_keep_negative_codes():
+    raster = class_raster([[-1, -128], [5, 127]], np.int8)
+    remapped = remap(raster, [-1, 5, 127], [7, -1, -128])
+    assert remapped.dtype == np.int8
+    assert remapped.values.tolist() == [[7, -128], [-1, -128]]
+
+
+def test_remap_keeps_coordinates():
+    raster = class_raster([[1, 10]], np.uint8).assign_coords(x=[0.5, 1.5], y=[9.5])
+    remapped = remap(raster, from_v2, to_solweig)
+    assert remapped.values.tolist() == [[5, 5]]
+    assert np.array_equal(remapped.x, raster.x)
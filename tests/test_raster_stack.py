@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from rasterio.transform import from_origin
+
+from heat_priority.raster_stack import is_stack, open_stack, write_stack
+
+
+@pytest.fixture
+def stack(tmp_path):
+    # 10 x 20 pixels of 10 m, origin (1000, 2000)
+    metadata = {'crs': 'EPSG:28992', 'transform': from_origin(1000, 2000, 10, 10)}
+    dsm = np.arange(200, dtype=np.float32).reshape(10, 20)
+    path = write_stack(str(tmp_path / 'stack.npy'), metadata, dsm=dsm, ndvi=-dsm)
+    return open_stack(path)
+
+
+def test_stack_round_trip(stack):
+    assert is_stack(stack.path)
+    assert stack.band_names == ['dsm', 'ndvi']
+    assert (stack.height, stack.width) == (10, 20)
+    assert stack.metadata['transform'] == from_origin(1000, 2000, 10, 10)
+    assert np.array_equal(stack['ndvi'], -np.arange(200, dtype=np.float32).reshape(10, 20))
+
+
+def test_window_covers_the_pixels_intersecting_the_bounds(stack):
+    # Partially covered pixels on every side are included
+    rows, cols = stack.window_bounds((1015, 1955, 1045, 1985))
+    assert (rows, cols) == (slice(1, 5), slice(1, 5))
+
+
+def test_window_is_clipped_at_the_stack_edges(stack):
+    rows, cols = stack.window_bounds((950, 1850, 1030, 2050))
+    assert (rows, cols) == (slice(0, 10), slice(0, 3))
+
+    rows, cols = stack.window_bounds((1180, 1990, 1300, 2100))
+    assert (rows, cols) == (slice(0, 1), slice(18, 20))
+
+
+def test_window_outside_the_stack_is_empty(stack):
+    data, _ = stack.read_window('dsm', (5000, 5000, 6000, 6000))
+    assert data.size == 0
+
+
+def test_read_window_transform_matches_the_data(stack):
+    data, transform = stack.read_window('dsm', (950, 1950, 1030, 2050))
+    assert data.shape == (5, 3)
+    assert transform * (0, 0) == (1000, 2000)
+    assert np.array_equal(data, stack['dsm'][:5, :3])
+
+    data, transform = stack.read_window('dsm', (1150, 1850, 1250, 1975))
+    assert data.shape == (8, 5)
+    assert transform * (0, 0) == (1150, 1980)
+    assert data[0, 0] == stack['dsm'][2, 15]